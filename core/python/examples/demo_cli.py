@@ -1,4 +1,5 @@
 from kinetiq_core import Unit, UserSettings, ExerciseConfig, SetLog, suggest_next_set
+from kinetiq_core.prompts import ask_int_min, ask_float_min, ask_rpe
 
 def main():
     settings = UserSettings(unit=Unit.LB, lb_increment=2.5, max_jump_lb=10.0)
@@ -19,9 +20,9 @@ def main():
     while True:
         try:
             print(f"Current target set: {current_weight} lb x {current_reps}")
-            reps = int(input("Reps performed: ").strip())
-            rpe = float(input("RPE (1-10): ").strip())
-            weight = float(input(f"Weight used ({settings.unit.value}): ").strip())
+            reps = ask_int_min("Reps performed: ", 1)
+            rpe = ask_rpe()
+            weight = ask_float_min(f"Weight used ({settings.unit.value}): ", 0.01)
 
             last = SetLog(weight=weight, reps=reps, rpe=rpe)
             sug = suggest_next_set(bench, last, settings, debug=False)
@@ -33,7 +34,7 @@ def main():
             current_weight = sug.next_weight
             current_reps = sug.next_reps
 
-        except KeyboardInterrupt:
+        except (KeyboardInterrupt, EOFError):
             print("\nBye.")
             break
         except Exception as e:
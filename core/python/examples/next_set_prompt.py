@@ -3,72 +3,19 @@ from __future__ import annotations
 from datetime import datetime
 
 from kinetiq_core import Unit, UserSettings, SetLog, suggest_next_set, make_exercise
-from kinetiq_core.storage import append_log, setlog_to_entry, load_logs
+from kinetiq_core.prompts import (
+    ask_nonempty,
+    ask_unit,
+    ask_int_min,
+    ask_float_min,
+    ask_rpe,
+    ask_rep_range,
+)
+from kinetiq_core.storage import append_log, default_log_path, setlog_to_entry, load_logs
 
 TARGET_RPE_RANGE = (7.0, 9.0)
 
 
-def ask_nonempty(prompt: str) -> str:
-    while True:
-        s = input(prompt).strip()
-        if s:
-            return s
-        print("❌ Please enter a value.\n")
-
-
-def ask_unit(default: Unit = Unit.LB) -> Unit:
-    while True:
-        s = input(f"Units (lb/kg) [{default.value}]: ").strip().lower()
-        if s == "":
-            return default
-        if s in ("lb", "lbs"):
-            return Unit.LB
-        if s in ("kg", "kgs"):
-            return Unit.KG
-        print("❌ Enter 'lb' or 'kg'.\n")
-
-
-def ask_int_min(prompt: str, lo: int) -> int:
-    while True:
-        try:
-            v = int(input(prompt).strip())
-            if v >= lo:
-                return v
-            print(f"❌ Must be ≥ {lo}.\n")
-        except ValueError:
-            print("❌ Enter a valid integer.\n")
-
-
-def ask_float_min(prompt: str, lo: float) -> float:
-    while True:
-        try:
-            v = float(input(prompt).strip())
-            if v >= lo:
-                return v
-            print(f"❌ Must be ≥ {lo}.\n")
-        except ValueError:
-            print("❌ Enter a valid number.\n")
-
-
-def ask_rpe() -> float:
-    while True:
-        try:
-            v = float(input("How hard was it? RPE (1–10): ").strip())
-            if 1.0 <= v <= 10.0:
-                return v
-            print("❌ RPE must be between 1 and 10.\n")
-        except ValueError:
-            print("❌ Enter a valid number (e.g. 7.5).\n")
-
-
-def ask_rep_range() -> tuple[int, int]:
-    rep_min = ask_int_min("Rep range MIN (>=1): ", 1)
-    rep_max = ask_int_min("Rep range MAX (>=1): ", 1)
-    if rep_max < rep_min:
-        rep_min, rep_max = rep_max, rep_min
-    return rep_min, rep_max
-
-
 def main() -> None:
     print("\nKinetiq: Next Set Suggestion (RPE-based)")
     print("Logs one set (weight, reps, RPE) and suggests the next set.")
@@ -98,7 +45,8 @@ def main() -> None:
 
     # log it
     ts = datetime.now().isoformat(timespec="seconds")
-    append_log(exercise_name, setlog_to_entry(last, ts))
+    log_path = default_log_path()
+    append_log(exercise_name, setlog_to_entry(last, ts), log_path)
 
     print("\nNext set recommendation")
     print(f"Exercise: {exercise_name}")
@@ -108,7 +56,7 @@ def main() -> None:
     print(f"Next set: {sug.next_weight:.1f} {sug.unit.value} x {sug.next_reps}")
     print(f"Why: {sug.explanation}\n")
 
-    print("Saved this set to data/set_logs.json")
+    print(f"Saved this set to {log_path}")
     print("To graph progression later: python examples/plot_progress.py\n")
 
 
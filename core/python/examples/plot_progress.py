@@ -1,9 +1,14 @@
 from __future__ import annotations
 
-import random
+import argparse
+import os
+import sys
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import List, Tuple, Optional
 
+import numpy as np
+
 from kinetiq_core import (
     Unit,
     UserSettings,
@@ -11,6 +16,9 @@ from kinetiq_core import (
     ExerciseConfig,
     suggest_next_set,
 )
+from kinetiq_core.rpe_rules import suggest_next_set_from_rpe
+from kinetiq_core.set_history import HistoryIndex
+from kinetiq_core.simulation import TARGET_RPE_RANGE, SimLifter, SimTable
 
 # Optional ML
 try:
@@ -18,10 +26,8 @@ try:
 except Exception:
     MLState = None
 
-TARGET_RPE_RANGE = (7.0, 9.0)
-
 
-@dataclass
+@dataclass(slots=True)
 class WeeklySimConfig:
     weeks: int = 16
     sessions_per_week: int = 2
@@ -38,67 +44,11 @@ class WeeklySimConfig:
     # ✅ ML toggle
     use_ml: bool = True
 
+    # Per-set console output; turn off for benchmark runs to skip all formatting
+    verbose: bool = True
 
-@dataclass
-class SimLifter:
-    base_strength: float = 185.0
-    sensitivity_weight: float = 1.0 / 25.0
-    sensitivity_reps: float = 1.0 / 2.5
-
-    fatigue_per_set: float = 0.18
-    readiness_noise: float = 0.60
-    rpe_noise: float = 0.25
-
-    adapt_good: float = 0.60
-    adapt_bad: float = 0.10
-
-    def sample_day_readiness(self) -> float:
-        return random.uniform(-self.readiness_noise, self.readiness_noise)
-
-    def rpe_for_set(
-        self,
-        weight: float,
-        reps: int,
-        rep_min: int,
-        set_in_session: int,
-        day_readiness: float,
-    ) -> float:
-        rpe = 7.0
-        rpe += (weight - self.base_strength) * self.sensitivity_weight
-        rpe += (reps - rep_min) * self.sensitivity_reps
-        rpe += set_in_session * self.fatigue_per_set
-        rpe -= day_readiness
-        rpe += random.uniform(-self.rpe_noise, self.rpe_noise)
-        return max(1.0, min(10.0, rpe))
-
-    def adapt_after_session(self, session_rpes: List[float]) -> None:
-        if not session_rpes:
-            return
-        in_zone = sum(1 for r in session_rpes if TARGET_RPE_RANGE[0] <= r <= TARGET_RPE_RANGE[1])
-        rate = in_zone / len(session_rpes)
-        self.base_strength += self.adapt_good if rate >= 0.60 else self.adapt_bad
-
-
-@dataclass
-class SimRecord:
-    week: int
-    session_in_week: int
-    set_in_session: int
-    global_set: int
-
-    weight: float
-    reps: int
-    rpe: float
-
-    action: str
-    next_weight: float
-    next_reps: int
-
-
-def simulate_over_weeks(cfg: WeeklySimConfig) -> List[SimRecord]:
-    if cfg.seed is not None:
-        random.seed(cfg.seed)
 
+def simulate_over_weeks(cfg: WeeklySimConfig) -> SimTable:
     rep_min, rep_max = cfg.rep_range
 
     settings = UserSettings(unit=Unit.LB)
@@ -108,7 +58,12 @@ def simulate_over_weeks(cfg: WeeklySimConfig) -> List[SimRecord]:
         target_rpe_range=TARGET_RPE_RANGE,
     )
 
-    lifter = SimLifter(base_strength=cfg.start_weight)
+    lifter = SimLifter(base_strength=cfg.start_weight, seed=cfg.seed)
+
+    # Draw every random number up front; only the prescription-dependent part
+    # of the RPE is left for the (inherently sequential) suggestion loop.
+    offset0 = float(lifter.sample_offsets(1, 1, 1)[0, 0, 0])
+    offsets = lifter.sample_offsets(cfg.weeks, cfg.sessions_per_week, cfg.sets_per_session)
 
     # ✅ persistent ML state (learns across all weeks)
     ml_state = None
@@ -119,127 +74,172 @@ def simulate_over_weeks(cfg: WeeklySimConfig) -> List[SimRecord]:
         else:
             ml_state = MLState()
 
+    # The ML policy reads the whole history (its buffer syncs on the growing list).
+    # RULES mode decides from the last set and the recent RPEs logged at the same
+    # weight x reps; the index keeps just those, updated in O(1) per set instead
+    # of the engine rescanning the whole history on every call, so a RULES run
+    # holds no per-set SetLogs at all.
     history: List[SetLog] = []
-    records: List[SimRecord] = []
+    index = HistoryIndex()
+    table = SimTable.allocate(cfg.weeks, cfg.sessions_per_week, cfg.sets_per_session)
 
     # Seed initial set
-    day0 = lifter.sample_day_readiness()
-    rpe0 = lifter.rpe_for_set(cfg.start_weight, cfg.start_reps, rep_min, 0, day0)
+    rpe0 = lifter.rpe_for_set(cfg.start_weight, cfg.start_reps, rep_min, offset0)
     current = SetLog(weight=cfg.start_weight, reps=cfg.start_reps, rpe=rpe0)
-    history.append(current)
-
-    mode = "ML (guardrailed by rules)" if cfg.use_ml else "RULES"
-    print(f"\nKinetiq Weekly Simulation ({mode})")
-    print(
-        f"Exercise: {cfg.exercise_name} | Rep range: {rep_min}-{rep_max} | "
-        f"Target RPE: {TARGET_RPE_RANGE[0]}–{TARGET_RPE_RANGE[1]}"
-    )
-    print(f"Weeks: {cfg.weeks} | Sessions/week: {cfg.sessions_per_week} | Sets/session: {cfg.sets_per_session}")
-    print("=" * 92)
+    if cfg.use_ml:
+        history.append(current)
+    else:
+        index.append(current)
+
+    if cfg.verbose:
+        mode = "ML (guardrailed by rules)" if cfg.use_ml else "RULES"
+        print(f"\nKinetiq Weekly Simulation ({mode})")
+        print(
+            f"Exercise: {cfg.exercise_name} | Rep range: {rep_min}-{rep_max} | "
+            f"Target RPE: {TARGET_RPE_RANGE[0]}–{TARGET_RPE_RANGE[1]}"
+        )
+        print(f"Weeks: {cfg.weeks} | Sessions/week: {cfg.sessions_per_week} | Sets/session: {cfg.sets_per_session}")
+        print("=" * 92)
 
     gset = 0
 
+    # Hoist everything the hot loop touches into locals (LOAD_FAST instead of
+    # global/attribute lookups on every set).
+    _sns = suggest_next_set
+    _rules = suggest_next_set_from_rpe
+    _SetLog = SetLog
+    _float = float
+    _int = int
+    _lo, _hi = TARGET_RPE_RANGE
+    _use_ml = cfg.use_ml
+    _verbose = cfg.verbose
+    _sets = cfg.sets_per_session
+    col_weight, col_reps, col_rpe = table.weight, table.reps, table.rpe
+    col_action, col_next_weight, col_next_reps = table.action, table.next_weight, table.next_reps
+
+    # Reused by every session; each set writes its own slot
+    session_rpes = np.empty(_sets)
+
     for week in range(1, cfg.weeks + 1):
         for sess in range(1, cfg.sessions_per_week + 1):
-            day_readiness = lifter.sample_day_readiness()
-            session_rpes: List[float] = []
-
-            print(f"\nWeek {week:02d} — Session {sess}/2  (true base_strength≈{lifter.base_strength:.1f} lb)")
-            print("-" * 92)
-
-            for set_idx in range(cfg.sets_per_session):
-                sug = suggest_next_set(
-                    exercise=ex,
-                    last_set=current,
-                    settings=settings,
-                    debug=False,
-                    use_ml=cfg.use_ml,
-                    ml_state=ml_state,
-                    user_id="sim_user",
-                    history=history,
-                )
-
-                performed_rpe = lifter.rpe_for_set(
-                    weight=float(sug.next_weight),
-                    reps=int(sug.next_reps),
-                    rep_min=rep_min,
-                    set_in_session=set_idx,
-                    day_readiness=day_readiness,
-                )
-
-                performed = SetLog(weight=float(sug.next_weight), reps=int(sug.next_reps), rpe=float(performed_rpe))
-                history.append(performed)
+            session_offsets = offsets[week - 1, sess - 1].tolist()
+            _rpe_for_set = lifter.rpe_fn  # recompiled after every session
+
+            # Buffer the session's output and write it once at the end of the session
+            lines: List[str] = []
+            if _verbose:
+                lines.append(f"\nWeek {week:02d} — Session {sess}/2  (true base_strength≈{lifter.base_strength:.1f} lb)")
+                lines.append("-" * 92)
+
+            for set_idx in range(_sets):
+                if _use_ml:
+                    sug = _sns(
+                        exercise=ex,
+                        last_set=current,
+                        settings=settings,
+                        debug=False,
+                        use_ml=True,
+                        ml_state=ml_state,
+                        user_id="sim_user",
+                        history=history,
+                    )
+                else:
+                    sug = _rules(current, ex, settings, history=index)
+
+                performed_weight = _float(sug.next_weight)
+                performed_reps = _int(sug.next_reps)
+                performed_rpe = _rpe_for_set(performed_weight, performed_reps, rep_min, session_offsets[set_idx])
+
+                performed = _SetLog(weight=performed_weight, reps=performed_reps, rpe=performed_rpe)
+                if _use_ml:
+                    history.append(performed)
+                else:
+                    index.append(performed)
                 current = performed
-                session_rpes.append(performed_rpe)
+                session_rpes[set_idx] = performed_rpe
 
                 gset += 1
-                in_zone = TARGET_RPE_RANGE[0] <= performed_rpe <= TARGET_RPE_RANGE[1]
-                zone = "✅" if in_zone else "⚠️"
-
-                print(
-                    f"Set {set_idx+1}: {zone} did {performed.weight:.1f} x {performed.reps} @ RPE {performed.rpe:.1f} "
-                    f"| action={sug.action} → next {sug.next_weight:.1f}x{sug.next_reps}"
-                )
-
-                records.append(
-                    SimRecord(
-                        week=week,
-                        session_in_week=sess,
-                        set_in_session=set_idx + 1,
-                        global_set=gset,
-                        weight=performed.weight,
-                        reps=performed.reps,
-                        rpe=performed.rpe,
-                        action=sug.action,
-                        next_weight=float(sug.next_weight),
-                        next_reps=int(sug.next_reps),
+                if _verbose:
+                    zone = "✅" if _lo <= performed_rpe <= _hi else "⚠️"
+                    lines.append(
+                        f"Set {set_idx+1}: {zone} did {performed_weight:.1f} x {performed_reps} @ RPE {performed_rpe:.1f} "
+                        f"| action={sug.action} → next {performed_weight:.1f}x{performed_reps}"
                     )
-                )
 
+                i = gset - 1
+                col_weight[i] = performed_weight
+                col_reps[i] = performed_reps
+                col_rpe[i] = performed_rpe
+                col_action[i] = sug.action
+                col_next_weight[i] = performed_weight
+                col_next_reps[i] = performed_reps
+
+            if _verbose:
+                sys.stdout.write("\n".join(lines) + "\n")
             lifter.adapt_after_session(session_rpes)
 
-    return records
+    return table
 
 
-def plot_records(records: List[SimRecord], title: str) -> None:
+@lru_cache(maxsize=None)
+def _pyplot():
+    """
+    Import matplotlib.pyplot once; None if matplotlib isn't installed.
+    Without an X display (headless Linux/CI) use the non-interactive Agg backend.
+    """
     try:
-        import matplotlib.pyplot as plt
+        import matplotlib
     except ImportError:
+        return None
+    if sys.platform not in ("darwin", "win32") and not os.environ.get("DISPLAY"):
+        matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    return plt
+
+
+def plot_records(table: SimTable, title: str, save_path: Optional[str] = None) -> None:
+    plt = _pyplot()
+    if plt is None:
         print("matplotlib not installed. Run: pip install matplotlib")
         return
 
-    xs = [r.global_set for r in records]
-    weights = [r.weight for r in records]
-    reps = [r.reps for r in records]
-    rpes = [r.rpe for r in records]
-
-    plt.figure()
-    plt.plot(xs, weights, marker="o", markersize=3)
-    plt.title(f"{title} — Weight Over Time")
-    plt.xlabel("Set (across weeks)")
-    plt.ylabel("Weight (lb)")
-    plt.tight_layout()
-    plt.show()
-
-    plt.figure()
-    plt.plot(xs, reps, marker="o", markersize=3)
-    plt.title(f"{title} — Reps Over Time")
-    plt.xlabel("Set (across weeks)")
-    plt.ylabel("Reps")
-    plt.tight_layout()
-    plt.show()
-
-    plt.figure()
-    plt.plot(xs, rpes, marker="o", markersize=3)
-    plt.title(f"{title} — RPE Over Time")
-    plt.xlabel("Set (across weeks)")
-    plt.ylabel("RPE")
-    plt.ylim(1, 10)
-    plt.tight_layout()
-    plt.show()
+    xs = table.global_set
+
+    fig, (ax_w, ax_r, ax_rpe) = plt.subplots(3, 1, sharex=True, figsize=(8, 9))
+    fig.suptitle(title)
+
+    ax_w.plot(xs, table.weight, marker="o", markersize=3)
+    ax_w.set_title("Weight Over Time")
+    ax_w.set_ylabel("Weight (lb)")
+
+    ax_r.plot(xs, table.reps, marker="o", markersize=3)
+    ax_r.set_title("Reps Over Time")
+    ax_r.set_ylabel("Reps")
+
+    ax_rpe.plot(xs, table.rpe, marker="o", markersize=3)
+    ax_rpe.set_title("RPE Over Time")
+    ax_rpe.set_ylabel("RPE")
+    ax_rpe.set_ylim(1, 10)
+    ax_rpe.set_xlabel("Set (across weeks)")
+
+    fig.tight_layout()
+    if save_path:
+        fig.savefig(save_path)
+    else:
+        plt.show()
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Kinetiq weekly training simulation")
+    parser.add_argument(
+        "--plot",
+        action=argparse.BooleanOptionalAction,
+        default=True,
+        help="chart the run with matplotlib (--no-plot skips importing it)",
+    )
+    parser.add_argument("--save", metavar="PATH", help="write the chart to PATH instead of opening a window")
+    args = parser.parse_args()
+
     cfg = WeeklySimConfig(
         weeks=16,
         sessions_per_week=2,
@@ -252,5 +252,6 @@ if __name__ == "__main__":
         use_ml=True,  # ✅ turn ML on/off here
     )
 
-    recs = simulate_over_weeks(cfg)
-    plot_records(recs, title="Kinetiq Weekly Simulation")
+    table = simulate_over_weeks(cfg)
+    if args.plot:
+        plot_records(table, title="Kinetiq Weekly Simulation", save_path=args.save)
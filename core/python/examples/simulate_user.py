@@ -1,8 +1,12 @@
 from __future__ import annotations
 
-import random
-from dataclasses import dataclass
-from typing import List, Tuple, Optional
+import os
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from functools import lru_cache, partial
+from typing import Callable, List, Tuple, Optional
+
+import numpy as np
 
 from kinetiq_core import (
     Unit,
@@ -14,6 +18,8 @@ from kinetiq_core import (
 
 TARGET_RPE_RANGE = (7.0, 9.0)
 
+SET_DTYPE = np.dtype([("weight", "f8"), ("reps", "i4"), ("rpe", "f8")])
+
 
 @dataclass
 class WeeklySimConfig:
@@ -33,6 +39,19 @@ class WeeklySimConfig:
     use_ml: bool = False
 
 
+def _rpe(
+    base_strength: float,
+    sensitivity_weight: float,
+    sensitivity_reps: float,
+    weight: float,
+    reps: int,
+    rep_min: int,
+    offset: float,
+) -> float:
+    rpe = 7.0 + (weight - base_strength) * sensitivity_weight + (reps - rep_min) * sensitivity_reps + offset
+    return max(1.0, min(10.0, rpe))
+
+
 @dataclass
 class SimLifter:
     base_strength: float = 185.0
@@ -46,24 +65,40 @@ class SimLifter:
     adapt_good: float = 0.55
     adapt_bad: float = 0.10
 
-    def sample_day_readiness(self) -> float:
-        return random.uniform(-self.readiness_noise, self.readiness_noise)
-
-    def rpe_for_set(
-        self,
-        weight: float,
-        reps: int,
-        rep_min: int,
-        set_in_session: int,
-        day_readiness: float,
-    ) -> float:
-        rpe = 7.0
-        rpe += (weight - self.base_strength) * self.sensitivity_weight
-        rpe += (reps - rep_min) * self.sensitivity_reps
-        rpe += set_in_session * self.fatigue_per_set
-        rpe -= day_readiness
-        rpe += random.uniform(-self.rpe_noise, self.rpe_noise)
-        return max(1.0, min(10.0, rpe))
+    seed: Optional[int] = None
+    _rng: np.random.Generator = field(init=False, repr=False)
+
+    def __post_init__(self):
+        # One generator per lifter: every draw of a run comes from this stream.
+        self._rng = np.random.default_rng(self.seed)
+        self.rpe_fn = self.make_rpe_fn()
+
+    def sample_noise(self, weeks: int, sessions: int, sets: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Draw all randomness for a run up front:
+        day readiness per (week, session), and per-set RPE noise with a second
+        column for the re-done set after a mid-session rep cut.
+        """
+        readiness = self._rng.uniform(-self.readiness_noise, self.readiness_noise, size=(weeks, sessions))
+        noise = self._rng.uniform(-self.rpe_noise, self.rpe_noise, size=(weeks, sessions, sets, 2))
+        return readiness, noise
+
+    def set_offsets(self, day_readiness: float, noise: np.ndarray) -> np.ndarray:
+        """Load-independent part of each set's RPE in a session: fatigue − readiness + noise."""
+        return np.arange(len(noise))[:, None] * self.fatigue_per_set - day_readiness + noise
+
+    def rpe_for_set(self, weight: float, reps: int, rep_min: int, offset: float) -> float:
+        return _rpe(
+            self.base_strength, self.sensitivity_weight, self.sensitivity_reps,
+            weight, reps, rep_min, offset,
+        )
+
+    def make_rpe_fn(self) -> Callable[[float, int, int, float], float]:
+        """
+        _rpe with the current constants pre-bound, so a call skips the
+        attribute loads of rpe_for_set. Rebuilt whenever base_strength adapts.
+        """
+        return partial(_rpe, self.base_strength, self.sensitivity_weight, self.sensitivity_reps)
 
     def adapt_after_session(self, session_rpes: List[float]) -> None:
         if not session_rpes:
@@ -71,43 +106,79 @@ class SimLifter:
         in_zone = sum(1 for r in session_rpes if TARGET_RPE_RANGE[0] <= r <= TARGET_RPE_RANGE[1])
         rate = in_zone / len(session_rpes)
         self.base_strength += self.adapt_good if rate >= 0.60 else self.adapt_bad
+        self.rpe_fn = self.make_rpe_fn()
+
+
+class SetHistory(Sequence):
+    """
+    Performed sets in one preallocated structured array.
+    Indexing returns SetLog so the engine can take it as `history`;
+    plotting reads the columns directly.
+    """
+
+    def __init__(self, capacity: int):
+        self.data = np.empty(capacity, dtype=SET_DTYPE)
+        self.n = 0
 
+    def append(self, weight: float, reps: int, rpe: float) -> None:
+        self.data[self.n] = (weight, reps, rpe)
+        self.n += 1
 
-def plot_records(history: List[SetLog], title: str) -> None:
+    def column(self, name: str) -> np.ndarray:
+        return self.data[name][: self.n]
+
+    def __len__(self) -> int:
+        return self.n
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(self.n))]
+        if i < 0:
+            i += self.n
+        if not 0 <= i < self.n:
+            raise IndexError(i)
+        weight, reps, rpe = self.data[i].item()
+        return SetLog(weight=weight, reps=reps, rpe=rpe)
+
+
+@lru_cache(maxsize=None)
+def _pyplot():
+    """Import matplotlib.pyplot once; None if matplotlib isn't installed."""
     try:
         import matplotlib.pyplot as plt
     except ImportError:
+        return None
+    return plt
+
+
+def plot_records(history: SetHistory, title: str) -> None:
+    if os.environ.get("KINETIQ_HEADLESS"):
+        return
+    plt = _pyplot()
+    if plt is None:
         print("matplotlib not installed. Run: pip install matplotlib")
         return
 
-    xs = list(range(1, len(history) + 1))
-    ws = [s.weight for s in history]
-    rs = [s.reps for s in history]
-    rpes = [s.rpe for s in history]
-
-    plt.figure()
-    plt.plot(xs, ws, marker="o", markersize=3)
-    plt.title(f"{title} — Weight Over Time")
-    plt.xlabel("Set #")
-    plt.ylabel("Weight (lb)")
-    plt.tight_layout()
-    plt.show()
+    xs = np.arange(1, len(history) + 1)
 
-    plt.figure()
-    plt.plot(xs, rs, marker="o", markersize=3)
-    plt.title(f"{title} — Reps Over Time")
-    plt.xlabel("Set #")
-    plt.ylabel("Reps")
-    plt.tight_layout()
-    plt.show()
+    fig, (ax_w, ax_r, ax_rpe) = plt.subplots(3, 1, sharex=True, figsize=(8, 10))
+    fig.suptitle(title)
+
+    ax_w.plot(xs, history.column("weight"), marker="o", markersize=3)
+    ax_w.set_title("Weight Over Time")
+    ax_w.set_ylabel("Weight (lb)")
 
-    plt.figure()
-    plt.plot(xs, rpes, marker="o", markersize=3)
-    plt.title(f"{title} — RPE Over Time")
-    plt.xlabel("Set #")
-    plt.ylabel("RPE")
-    plt.ylim(1, 10)
-    plt.tight_layout()
+    ax_r.plot(xs, history.column("reps"), marker="o", markersize=3)
+    ax_r.set_title("Reps Over Time")
+    ax_r.set_ylabel("Reps")
+
+    ax_rpe.plot(xs, history.column("rpe"), marker="o", markersize=3)
+    ax_rpe.set_title("RPE Over Time")
+    ax_rpe.set_ylabel("RPE")
+    ax_rpe.set_ylim(1, 10)
+    ax_rpe.set_xlabel("Set #")
+
+    fig.tight_layout()
     plt.show()
 
 
@@ -124,9 +195,6 @@ def main() -> None:
         use_ml=False,
     )
 
-    if cfg.seed is not None:
-        random.seed(cfg.seed)
-
     rep_min, rep_max = cfg.rep_range
 
     settings = UserSettings(unit=Unit.LB)
@@ -136,15 +204,18 @@ def main() -> None:
         target_rpe_range=TARGET_RPE_RANGE,
     )
 
-    lifter = SimLifter(base_strength=cfg.start_weight)
+    lifter = SimLifter(base_strength=cfg.start_weight, seed=cfg.seed)
 
-    history: List[SetLog] = []
+    history = SetHistory(cfg.weeks * cfg.sessions_per_week * cfg.sets_per_session + 1)
+
+    # Row 0 holds the draws for the seed set; weeks index from 1.
+    readiness, noise = lifter.sample_noise(cfg.weeks + 1, cfg.sessions_per_week, cfg.sets_per_session)
 
     # Seed initial set
-    day0 = lifter.sample_day_readiness()
-    rpe0 = lifter.rpe_for_set(cfg.start_weight, cfg.start_reps, rep_min, 0, day0)
-    current = SetLog(weight=cfg.start_weight, reps=cfg.start_reps, rpe=rpe0)
-    history.append(current)
+    rpe0 = lifter.rpe_for_set(
+        cfg.start_weight, cfg.start_reps, rep_min, lifter.set_offsets(readiness[0, 0], noise[0, 0])[0, 0]
+    )
+    history.append(cfg.start_weight, cfg.start_reps, rpe0)
 
     print("\nKinetiq Weekly Simulation (JEFF-STYLE B — RULES mode)")
     print("Double progression + RPE drop-by-1 trigger for load increases.\n")
@@ -158,10 +229,13 @@ def main() -> None:
     total_sets = 0
     in_zone_count = 0
 
+    # Every session fills exactly sets_per_session slots, so one list is reused.
+    session_rpes: List[float] = [0.0] * cfg.sets_per_session
+
     for week in range(1, cfg.weeks + 1):
         for sess in range(1, cfg.sessions_per_week + 1):
-            day_readiness = lifter.sample_day_readiness()
-            session_rpes: List[float] = []
+            offsets = lifter.set_offsets(readiness[week, sess - 1], noise[week, sess - 1])
+            rpe_fn = lifter.rpe_fn
 
             print(f"\nWeek {week:02d} — Session {sess}/2  (true base_strength≈{lifter.base_strength:.1f} lb)")
             print("-" * 92)
@@ -171,7 +245,7 @@ def main() -> None:
             # ----------------------------
             top_sug = suggest_next_set(
                 exercise=ex,
-                last_set=current,
+                last_set=history[-1],
                 settings=settings,
                 debug=False,
                 use_ml=cfg.use_ml,
@@ -181,24 +255,18 @@ def main() -> None:
             )
 
             # Perform TOP SET
-            top_rpe = lifter.rpe_for_set(
-                weight=float(top_sug.next_weight),
-                reps=int(top_sug.next_reps),
-                rep_min=rep_min,
-                set_in_session=0,
-                day_readiness=day_readiness,
-            )
-            top_performed = SetLog(weight=float(top_sug.next_weight), reps=int(top_sug.next_reps), rpe=float(top_rpe))
-            history.append(top_performed)
-            current = top_performed
-            session_rpes.append(top_rpe)
+            top_weight = float(top_sug.next_weight)
+            top_reps = int(top_sug.next_reps)
+            top_rpe = rpe_fn(top_weight, top_reps, rep_min, offsets[0, 0])
+            history.append(top_weight, top_reps, top_rpe)
+            session_rpes[0] = top_rpe
 
             total_sets += 1
             in_zone = TARGET_RPE_RANGE[0] <= top_rpe <= TARGET_RPE_RANGE[1]
             in_zone_count += 1 if in_zone else 0
             zone = "✅" if in_zone else "⚠️"
             print(
-                f"Set 1 (TOP): {zone} did {top_performed.weight:.1f} x {top_performed.reps} @ RPE {top_performed.rpe:.1f} "
+                f"Set 1 (TOP): {zone} did {top_weight:.1f} x {top_reps} @ RPE {top_rpe:.1f} "
                 f"| action={top_sug.action} → next {top_sug.next_weight:.1f}x{top_sug.next_reps}"
             )
 
@@ -206,33 +274,19 @@ def main() -> None:
             # BACKOFF SETS: repeat top prescription
             # Only auto-reduce if too hard.
             # ----------------------------
-            backoff_weight = top_performed.weight
-            backoff_reps = top_performed.reps
+            backoff_weight = top_weight
+            backoff_reps = top_reps
 
             for set_idx in range(1, cfg.sets_per_session):
-                performed_rpe = lifter.rpe_for_set(
-                    weight=float(backoff_weight),
-                    reps=int(backoff_reps),
-                    rep_min=rep_min,
-                    set_in_session=set_idx,
-                    day_readiness=day_readiness,
-                )
+                performed_rpe = rpe_fn(backoff_weight, backoff_reps, rep_min, offsets[set_idx, 0])
 
                 # Safety adjustment mid-session if it's too hard
                 if performed_rpe > TARGET_RPE_RANGE[1] and backoff_reps > rep_min:
                     backoff_reps -= 1
-                    performed_rpe = lifter.rpe_for_set(
-                        weight=float(backoff_weight),
-                        reps=int(backoff_reps),
-                        rep_min=rep_min,
-                        set_in_session=set_idx,
-                        day_readiness=day_readiness,
-                    )
-
-                performed = SetLog(weight=float(backoff_weight), reps=int(backoff_reps), rpe=float(performed_rpe))
-                history.append(performed)
-                current = performed
-                session_rpes.append(performed_rpe)
+                    performed_rpe = rpe_fn(backoff_weight, backoff_reps, rep_min, offsets[set_idx, 1])
+
+                history.append(backoff_weight, backoff_reps, performed_rpe)
+                session_rpes[set_idx] = performed_rpe
 
                 total_sets += 1
                 in_zone = TARGET_RPE_RANGE[0] <= performed_rpe <= TARGET_RPE_RANGE[1]
@@ -240,8 +294,8 @@ def main() -> None:
                 zone = "✅" if in_zone else "⚠️"
 
                 print(
-                    f"Set {set_idx+1} (BK): {zone} did {performed.weight:.1f} x {performed.reps} @ RPE {performed.rpe:.1f} "
-                    f"| action=stay → next {performed.weight:.1f}x{performed.reps}"
+                    f"Set {set_idx+1} (BK): {zone} did {backoff_weight:.1f} x {backoff_reps} @ RPE {performed_rpe:.1f} "
+                    f"| action=stay → next {backoff_weight:.1f}x{backoff_reps}"
                 )
 
             lifter.adapt_after_session(session_rpes)
@@ -3,10 +3,23 @@ from .engine import suggest_next_set
 from .presets import make_exercise, common_presets
 from .progression import jump_from_rpe, jump_from_rpe_lb, rep_delta_from_rpe
 
-try:
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
     from .ml import MLState
-except Exception:
-    MLState = None
+
+
+def __getattr__(name: str):
+    # PEP 562: the optional ML stack (NumPy) is only imported when MLState is first used.
+    if name == "MLState":
+        try:
+            from .ml import MLState
+        except Exception:
+            MLState = None
+        globals()["MLState"] = MLState
+        return MLState
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 __all__ = [
     "Unit",
@@ -1,19 +1,31 @@
 from __future__ import annotations
 
 from dataclasses import replace
-from typing import List, Optional
+from functools import lru_cache
+from typing import TYPE_CHECKING, Callable, List, Optional
 
 from .models import SetLog, SetLogWithTs, ExerciseConfig, UserSettings, Suggestion
 from .rpe_rules import suggest_next_set_from_rpe
 from .presets import adaptation_rate_for_exercise
 
-# Optional ML
-try:
-    from .ml.policy import suggest_next_set_ml
+if TYPE_CHECKING:
     from .ml.state import MLState
-except Exception:
-    suggest_next_set_ml = None
-    MLState = None
+
+
+@lru_cache(maxsize=None)
+def _ml_policy() -> Optional[Callable[..., Suggestion]]:
+    """Optional ML, imported on the first use_ml call; None if unavailable."""
+    try:
+        from .ml.policy import suggest_next_set_ml
+    except Exception:
+        return None
+    return suggest_next_set_ml
+
+
+@lru_cache(maxsize=4096)
+def _rules_cached(exercise: ExerciseConfig, last_set: SetLog, settings: UserSettings) -> Suggestion:
+    """Without history the rules are pure in these (frozen, hashable) inputs."""
+    return suggest_next_set_from_rpe(last_set=last_set, cfg=exercise, settings=settings, history=[])
 
 
 def suggest_next_set(
@@ -33,7 +45,8 @@ def suggest_next_set(
     - Else -> deterministic rpe_rules (Jeff-style B uses history to detect RPE drops).
     - Always attaches plateau_info and rpe_reliability to the returned Suggestion.
     """
-    if use_ml and suggest_next_set_ml is not None and ml_state is not None:
+    suggest_next_set_ml = _ml_policy() if use_ml and ml_state is not None else None
+    if suggest_next_set_ml is not None:
         base = suggest_next_set_ml(
             state=ml_state,
             user_id=user_id,
@@ -43,6 +56,8 @@ def suggest_next_set(
             history=history or [],
             debug=debug,
         )
+    elif not history and not debug:
+        base = _rules_cached(exercise, last_set, settings)
     else:
         # ✅ pass history into rules
         base = suggest_next_set_from_rpe(
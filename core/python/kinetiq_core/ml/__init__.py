@@ -1,4 +1,4 @@
 from .state import MLState
-from .policy import suggest_next_set_ml
+from .policy import EXPLORATORY_POLICY, SAFE_POLICY, PolicyConfig, suggest_next_set_ml
 
-__all__ = ["MLState", "suggest_next_set_ml"]
+__all__ = ["MLState", "suggest_next_set_ml", "PolicyConfig", "SAFE_POLICY", "EXPLORATORY_POLICY"]
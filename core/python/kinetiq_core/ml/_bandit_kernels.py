@@ -0,0 +1,37 @@
+"""
+Array kernels for LinUCBBandit.
+
+They operate on the bandit's stacked per-action state (Ainv_stack: (A, d, d),
+b_stack: (A, d)) so choose() does not go through per-action dict lookups.
+"""
+from __future__ import annotations
+
+import numpy as np
+
+
+def ucb_scores(
+    Ainv_stack: np.ndarray,
+    b_stack: np.ndarray,
+    rows: np.ndarray,
+    x: np.ndarray,
+    alpha: float,
+) -> np.ndarray:
+    """UCB score of each action in `rows`: theta_a · x + alpha * sqrt(x^T Ainv_a x)."""
+    # One batched matvec serves both terms: Ainv is symmetric, so
+    # theta_a · x = (Ainv_a b_a) · x = b_a · (Ainv_a x).
+    Ax = np.einsum("adk,k->ad", Ainv_stack[rows], x)  # (K, d)
+    means = np.einsum("ad,ad->a", Ax, b_stack[rows])
+    var = Ax @ x                                      # x^T Ainv_a x
+    return means + alpha * np.sqrt(np.maximum(var, 0.0), dtype=np.float32)
+
+
+def choose_kernel(
+    Ainv_stack: np.ndarray,
+    b_stack: np.ndarray,
+    rows: np.ndarray,
+    x: np.ndarray,
+    alpha: float,
+    penalty: np.ndarray,
+) -> int:
+    """Position in `rows` with the highest UCB score minus its penalty (first wins ties)."""
+    return int((ucb_scores(Ainv_stack, b_stack, rows, x, alpha) - penalty).argmax())
@@ -0,0 +1,68 @@
+"""
+Array kernel for the ML policy's candidate scoring.
+
+Candidates come in as parallel arrays (weight, reps, integer action id) so the
+scoring never touches SetLog/ExerciseConfig/UserSettings.
+"""
+from __future__ import annotations
+
+from typing import Tuple
+
+import numpy as np
+
+from ..models import ACTION_NAMES, ActionCode
+
+# Action ids are the models.ActionCode values (ACTION_NAMES[id] is the name), as plain ints
+ADD_WEIGHT, ADD_REPS, STAY, LOWER_REPS, LOWER_WEIGHT = (
+    int(ActionCode.ADD_WEIGHT),
+    int(ActionCode.ADD_REPS),
+    int(ActionCode.STAY),
+    int(ActionCode.LOWER_REPS),
+    int(ActionCode.LOWER_WEIGHT),
+)
+
+# The bandit's arms, in its action order: score ties go to the first arm, so this
+# order (not the ActionCode order) is part of the policy's behaviour.
+BANDIT_ARMS: Tuple[int, ...] = (ADD_WEIGHT, ADD_REPS, STAY, LOWER_REPS, LOWER_WEIGHT)
+BANDIT_ARM_NAMES: Tuple[str, ...] = tuple(ACTION_NAMES[a] for a in BANDIT_ARMS)
+
+
+def _score_candidates(
+    cand_w: np.ndarray,
+    cand_reps: np.ndarray,
+    pred_rpe: np.ndarray,
+    last_w: float,
+    last_reps: int,
+    rpe_min: float,
+    rpe_max: float,
+    calibrated_rpe: float,
+    preferred_idx: int,
+    action_idx: np.ndarray,
+    max_pred_rpe: float,
+    closeness_width: float,
+    progress_w_scale: float,
+    rep_progress_bonus: float,
+) -> Tuple[int, float]:
+    """Returns (best candidate position, its score); position is -1 if none is safe."""
+    # Target-zone closeness: 1 inside the zone, minus 1/closeness_width per RPE point outside it
+    closeness = 1.0 - np.maximum(0.0, np.maximum(rpe_min - pred_rpe, pred_rpe - rpe_max)) / closeness_width
+
+    # Progress reward (weight > reps)
+    progress = np.maximum(0.0, cand_w - last_w) / progress_w_scale + rep_progress_bonus * (cand_reps > last_reps)
+
+    # Penalize unsafe behavior
+    penalty = 0.6 * (calibrated_rpe >= 8.7) * (action_idx == ADD_WEIGHT)
+    penalty = penalty + 0.5 * (calibrated_rpe >= 9.0) * (action_idx == ADD_REPS)
+
+    # Bandit preference (small nudge only)
+    preference = 0.15 * (action_idx == preferred_idx)
+
+    scores = closeness + progress + preference - penalty
+
+    # HARD STOP: never allow predicted RPE above max_pred_rpe
+    safe = pred_rpe <= max_pred_rpe
+    if not safe.any():
+        return -1, 0.0
+
+    i = int(np.where(safe, scores, -np.inf).argmax())
+    return i, float(scores[i])
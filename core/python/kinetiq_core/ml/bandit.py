@@ -1,63 +1,59 @@
 from __future__ import annotations
 
-import math
 from dataclasses import dataclass, field
-from typing import Dict, List
+from typing import Any, ClassVar, Dict, List, Optional, Sequence, Type, Union
 
+import numpy as np
 
-def dot(a: List[float], b: List[float]) -> float:
-    return sum(x * y for x, y in zip(a, b))
+from ._bandit_kernels import choose_kernel, ucb_scores
 
-
-def matvec(A: List[List[float]], x: List[float]) -> List[float]:
-    return [dot(row, x) for row in A]
-
-
-def identity(d: int) -> List[List[float]]:
-    return [[1.0 if i == j else 0.0 for j in range(d)] for i in range(d)]
-
-
-def outer(x: List[float]) -> List[List[float]]:
-    return [[xi * xj for xj in x] for xi in x]
-
-
-def add_inplace(A: List[List[float]], B: List[List[float]], scale: float = 1.0) -> None:
-    for i in range(len(A)):
-        for j in range(len(A[0])):
-            A[i][j] += scale * B[i][j]
-
-
-def sherman_morrison_inv_update(Ainv: List[List[float]], x: List[float]) -> None:
-    u = matvec(Ainv, x)
-    denom = 1.0 + dot(x, u)
-    if denom == 0:
-        return
-    # Ainv = Ainv - (u u^T)/denom
-    uuT = [[ui * uj for uj in u] for ui in u]
-    add_inplace(Ainv, uuT, scale=-1.0 / denom)
+Vector = Union[np.ndarray, Sequence[float]]
 
 
 @dataclass
 class LinUCBBandit:
+    kind: ClassVar[str] = "linucb"
+
     dim: int
     alpha: float = 1.5
-    Ainv: Dict[str, List[List[float]]] = field(default_factory=dict)
-    b: Dict[str, List[float]] = field(default_factory=dict)
+    Ainv: Dict[str, np.ndarray] = field(default_factory=dict)
+    b: Dict[str, np.ndarray] = field(default_factory=dict)
     action_history: Dict[str, List[str]] = field(default_factory=dict)
     oscillation_penalty: float = 0.2
 
+    def __post_init__(self):
+        # Per-action state lives in contiguous stacks; Ainv[a] / b[a] are views into them.
+        self.action_index: Dict[str, int] = {}
+        self._Ainv_stack = np.empty((0, self.dim, self.dim), dtype=np.float32)
+        self._b_stack = np.empty((0, self.dim), dtype=np.float32)
+        self._outer_buf = np.empty((self.dim, self.dim), dtype=np.float32)  # update() scratch
+        Ainv0, b0 = self.Ainv, self.b
+        self.Ainv, self.b = {}, {}
+        if Ainv0:
+            self._stack(
+                list(Ainv0),
+                np.array([np.asarray(m, dtype=np.float32) for m in Ainv0.values()]),
+                np.array([np.asarray(b0[a], dtype=np.float32) for a in Ainv0]),
+            )
+
+    def _stack(self, actions: List[str], Ainv_rows: np.ndarray, b_rows: np.ndarray) -> None:
+        self._Ainv_stack = np.concatenate([self._Ainv_stack, Ainv_rows])
+        self._b_stack = np.concatenate([self._b_stack, b_rows])
+        for a in actions:
+            self.action_index[a] = len(self.action_index)
+        for a, i in self.action_index.items():
+            self.Ainv[a] = self._Ainv_stack[i]
+            self.b[a] = self._b_stack[i]
+
     def _ensure(self, action: str) -> None:
-        if action not in self.Ainv:
-            self.Ainv[action] = identity(self.dim)
-            self.b[action] = [0.0] * self.dim
+        if action not in self.action_index:
+            self._stack([action], np.eye(self.dim, dtype=np.float32)[None], np.zeros((1, self.dim), dtype=np.float32))
 
-    def score(self, action: str, x: List[float]) -> float:
+    def score(self, action: str, x: Vector) -> float:
         self._ensure(action)
-        theta = matvec(self.Ainv[action], self.b[action])
-        mean = dot(theta, x)
-        Ax = matvec(self.Ainv[action], x)
-        var = dot(x, Ax)
-        return mean + self.alpha * math.sqrt(max(0.0, var))
+        rows = np.array([self.action_index[action]])
+        x = np.asarray(x, dtype=np.float32)
+        return float(ucb_scores(self._Ainv_stack, self._b_stack, rows, x, self.alpha)[0])
 
     def _oscillation_penalty(self, action: str, user_key: str = "default") -> float:
         """Return penalty if action would continue an alternating A→B→A pattern."""
@@ -71,22 +67,110 @@ class LinUCBBandit:
             return self.oscillation_penalty
         return 0.0
 
-    def choose(self, actions: List[str], x: List[float], user_key: str = "default") -> str:
-        best = actions[0]
-        best_s = self.score(best, x) - self._oscillation_penalty(best, user_key)
-        for a in actions[1:]:
-            s = self.score(a, x) - self._oscillation_penalty(a, user_key)
-            if s > best_s:
-                best, best_s = a, s
-        return best
-
-    def update(self, action: str, x: List[float], reward: float, user_key: str = "default") -> None:
+    def choose(self, actions: List[str], x: Vector, user_key: str = "default") -> str:
+        return actions[self.choose_index(actions, x, user_key)]
+
+    def choose_index(self, actions: Sequence[str], x: Vector, user_key: str = "default") -> int:
+        """Like choose(), but returns the position in `actions` (callers can keep integer codes)."""
+        for a in actions:
+            self._ensure(a)
+        rows = np.array([self.action_index[a] for a in actions])
+        penalty = np.array([self._oscillation_penalty(a, user_key) for a in actions])
+        return choose_kernel(
+            self._Ainv_stack, self._b_stack, rows, np.asarray(x, dtype=np.float32), self.alpha, penalty
+        )
+
+    def update(self, action: str, x: Vector, reward: float, user_key: str = "default") -> None:
+        x = np.asarray(x, dtype=np.float32)
         self._ensure(action)
-        sherman_morrison_inv_update(self.Ainv[action], x)
-        for i in range(self.dim):
-            self.b[action][i] += reward * x[i]
+        # Sherman–Morrison, in place: Ainv -= (Ainv x)(Ainv x)^T / (1 + x^T Ainv x)
+        Ainv = self.Ainv[action]
+        u = Ainv @ x
+        denom = 1.0 + float(x @ u)
+        if denom > 1e-7:  # float32 drift can leave Ainv slightly indefinite
+            np.subtract(Ainv, np.outer(u, u / np.float32(denom), out=self._outer_buf), out=Ainv)
+        self.b[action] += np.float32(reward) * x
         # Track action history for oscillation detection (capped at 20 entries)
         hist = self.action_history.setdefault(user_key, [])
         hist.append(action)
         if len(hist) > 20:
             self.action_history[user_key] = hist[-20:]
+
+    def to_dict(self) -> dict:
+        return {
+            "kind": self.kind,
+            "dim": self.dim,
+            "alpha": self.alpha,
+            "Ainv": {a: m.tolist() for a, m in self.Ainv.items()},
+            "b": {a: v.tolist() for a, v in self.b.items()},
+            "action_history": self.action_history,
+        }
+
+    @classmethod
+    def from_dict(cls, d: dict) -> "LinUCBBandit":
+        # d["kind"] picks the class; states saved before it was stored are LinUCB
+        bandit_cls = BANDIT_KINDS[d.get("kind", LinUCBBandit.kind)]
+        return bandit_cls(**bandit_cls._init_kwargs(d))
+
+    @classmethod
+    def _init_kwargs(cls, d: dict) -> Dict[str, Any]:
+        return {
+            "dim": d["dim"],
+            "alpha": d["alpha"],
+            "Ainv": d["Ainv"],
+            "b": d["b"],
+            "action_history": d.get("action_history", {}),
+        }
+
+
+@dataclass
+class LinearTSBandit(LinUCBBandit):
+    """
+    Linear Thompson Sampling over the same per-action posterior state as
+    LinUCBBandit (Ainv = B_a^{-1}, b = f_a, mu_a = B_a^{-1} f_a).
+
+    choose_index() draws theta_a ~ N(mu_a, alpha^2 B_a^{-1}) for every action at
+    once (one batched Cholesky) and picks argmax x · theta_a minus the
+    oscillation penalty. update() and history are inherited; serialization
+    adds the seed (a reloaded bandit restarts its draws from it).
+    """
+    kind: ClassVar[str] = "linear_ts"
+
+    seed: Optional[int] = None
+
+    def __post_init__(self):
+        super().__post_init__()
+        self._rng = np.random.default_rng(self.seed)
+
+    def to_dict(self) -> dict:
+        return {**super().to_dict(), "seed": self.seed}
+
+    @classmethod
+    def _init_kwargs(cls, d: dict) -> Dict[str, Any]:
+        return {**super()._init_kwargs(d), "seed": d.get("seed")}
+
+    def choose_index(self, actions: Sequence[str], x: Vector, user_key: str = "default") -> int:
+        for a in actions:
+            self._ensure(a)
+        rows = np.array([self.action_index[a] for a in actions])
+        Binv = self._Ainv_stack[rows].astype(np.float64)
+        mu = np.einsum("adk,ak->ad", Binv, self._b_stack[rows])
+        z = self._rng.standard_normal(mu.shape)
+        try:
+            # Symmetrize: float32 Sherman–Morrison updates drift slightly
+            L = np.linalg.cholesky((Binv + Binv.transpose(0, 2, 1)) / 2.0)
+            theta = mu + self.alpha * np.einsum("adk,ak->ad", L, z)
+        except np.linalg.LinAlgError:
+            theta = mu  # posterior lost positive-definiteness → act on the mean
+        penalty = np.array([self._oscillation_penalty(a, user_key) for a in actions])
+        return int((theta @ np.asarray(x, dtype=np.float64) - penalty).argmax())
+
+
+BANDIT_KINDS: Dict[str, Type[LinUCBBandit]] = {c.kind: c for c in (LinUCBBandit, LinearTSBandit)}
+
+
+def make_bandit(kind: str = LinUCBBandit.kind, **kwargs: Any) -> LinUCBBandit:
+    """A new bandit of the given kind ("linucb" or "linear_ts"); kwargs go to its constructor."""
+    if kind not in BANDIT_KINDS:
+        raise ValueError(f"Unknown bandit kind {kind!r}; expected one of {sorted(BANDIT_KINDS)}")
+    return BANDIT_KINDS[kind](**kwargs)
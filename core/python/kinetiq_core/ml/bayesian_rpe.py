@@ -4,6 +4,8 @@ import math
 from dataclasses import dataclass, field
 from typing import List, Tuple
 
+from ..units import clamp
+
 
 # ── Pure-Python matrix utilities (self-contained, no bandit.py import) ────────
 
@@ -56,6 +58,13 @@ def _solve(A: List[List[float]], b: List[float]) -> List[float]:
     return x
 
 
+def _invert(A: List[List[float]]) -> List[List[float]]:
+    """A^{-1} column by column via _solve (only needed when loading an old snapshot)."""
+    d = len(A)
+    cols = [_solve(A, [1.0 if i == j else 0.0 for i in range(d)]) for j in range(d)]
+    return [[cols[j][i] for j in range(d)] for i in range(d)]
+
+
 # ── Bayesian RPE Predictor ─────────────────────────────────────────────────────
 
 @dataclass
@@ -70,10 +79,14 @@ class BayesianRPEPredictor:
         S_inv_new = S_inv + (1/noise_variance) * x x^T
         b_new     = b     + (1/noise_variance) * y * x
 
+    The covariance S itself is kept alongside via Sherman–Morrison, so an
+    update is O(d^2) and predict needs no linear solves:
+        S_new = S - (S x)(S x)^T / (noise_variance + x^T S x)
+
     Predict:
-        m    = S_inv^{-1} b  (solve via Gaussian elimination)
+        m    = S b
         mean = m^T x
-        pred_var = noise_variance + x^T S_inv^{-1} x
+        pred_var = noise_variance + x^T S x
         uncertainty_95 = 1.96 * sqrt(pred_var)
     """
 
@@ -84,10 +97,15 @@ class BayesianRPEPredictor:
     # Precision matrix and information vector (initialized to prior)
     _S_inv: List[List[float]] = field(default_factory=list)
     _b: List[float] = field(default_factory=list)
+    # Covariance S = S_inv^{-1}
+    _S: List[List[float]] = field(default_factory=list)
 
     def __post_init__(self) -> None:
         if not self._S_inv:
             self._S_inv = _scaled_identity(self.dim, self.prior_precision)
+            self._S = _scaled_identity(self.dim, 1.0 / self.prior_precision)
+        elif not self._S:
+            self._S = _invert(self._S_inv)
         if not self._b:
             self._b = [0.0] * self.dim
 
@@ -96,6 +114,9 @@ class BayesianRPEPredictor:
         inv_noise = 1.0 / self.noise_variance
         # S_inv += (1/sigma^2) * x x^T
         _add_rank1(self._S_inv, x, scale=inv_noise)
+        # S -= (S x)(S x)^T / (sigma^2 + x^T S x)
+        Sx = _matvec(self._S, x)
+        _add_rank1(self._S, Sx, scale=-1.0 / (self.noise_variance + _dot(x, Sx)))
         # b += (1/sigma^2) * y * x
         for i in range(self.dim):
             self._b[i] += inv_noise * y_rpe * x[i]
@@ -105,17 +126,16 @@ class BayesianRPEPredictor:
         Returns (predicted_rpe, uncertainty_95_halfwidth).
         uncertainty_95 = 1.96 * sqrt(predictive_variance).
         """
-        m = _solve(self._S_inv, self._b)
+        m = _matvec(self._S, self._b)
         mean = _dot(m, x)
 
-        # Predictive variance: sigma^2 + x^T (S_inv^{-1}) x
-        # We need to solve S_inv @ v = x, then dot(x, v)
-        v = _solve(self._S_inv, x)
+        # Predictive variance: sigma^2 + x^T S x
+        v = _matvec(self._S, x)
         pred_var = self.noise_variance + _dot(x, v)
         uncertainty_95 = 1.96 * math.sqrt(max(0.0, pred_var))
 
         # Clamp mean to valid RPE range
-        mean = max(1.0, min(10.0, mean))
+        mean = clamp(mean, 1.0, 10.0)
         return mean, uncertainty_95
 
     def predict_mean(self, x: List[float]) -> float:
@@ -129,16 +149,18 @@ class BayesianRPEPredictor:
             "prior_precision": self.prior_precision,
             "noise_variance": self.noise_variance,
             "S_inv": self._S_inv,
+            "S": self._S,
             "b": self._b,
         }
 
     @classmethod
     def from_dict(cls, d: dict) -> "BayesianRPEPredictor":
-        obj = cls(
+        # Snapshots written before S was stored get it by one inversion here
+        return cls(
             dim=d["dim"],
             prior_precision=d["prior_precision"],
             noise_variance=d["noise_variance"],
+            _S_inv=d["S_inv"],
+            _b=d["b"],
+            _S=d.get("S", []),
         )
-        obj._S_inv = d["S_inv"]
-        obj._b = d["b"]
-        return obj
@@ -1,5 +1,8 @@
 from __future__ import annotations
 from dataclasses import dataclass
+from typing import Sequence, Union
+
+import numpy as np
 
 
 @dataclass
@@ -15,6 +18,20 @@ class RPECalibration:
         delta2 = residual - self.bias
         self.m2 += delta * delta2
 
+    def update_batch(self, residuals: Union[np.ndarray, Sequence[float]]) -> None:
+        """Fold in a batch of residuals at once (Chan's parallel merge); same result as N update() calls."""
+        r = np.asarray(residuals, dtype=float)
+        n_b = len(r)
+        if n_b == 0:
+            return
+        mean_b = float(r.mean())
+        m2_b = float(((r - mean_b) ** 2).sum())
+        n = self.n + n_b
+        delta = mean_b - self.bias
+        self.bias += delta * n_b / n
+        self.m2 += m2_b + delta * delta * self.n * n_b / n
+        self.n = n
+
     @property
     def variance(self) -> float:
         if self.n < 2:
@@ -1,17 +1,31 @@
 from __future__ import annotations
 
-import random
 from dataclasses import dataclass, field
-from typing import Dict, List
+from typing import Dict, Optional
+
+import numpy as np
 
 
 @dataclass
 class EmbeddingTable:
     dim: int
     lr: float = 0.05
-    table: Dict[str, List[float]] = field(default_factory=dict)
+    table: Dict[str, np.ndarray] = field(default_factory=dict)
+    seed: Optional[int] = None
+
+    def __post_init__(self):
+        self.table = {k: np.asarray(v, dtype=np.float32) for k, v in self.table.items()}
+        self._rng = np.random.default_rng(self.seed)
+
+    def get(self, key: str) -> np.ndarray:
+        row = self.table.get(key)
+        if row is None:
+            row = self.table[key] = self._rng.uniform(-0.05, 0.05, self.dim).astype(np.float32)
+        return row
+
+    def to_dict(self) -> dict:
+        return {"dim": self.dim, "lr": self.lr, "table": {k: v.tolist() for k, v in self.table.items()}}
 
-    def get(self, key: str) -> List[float]:
-        if key not in self.table:
-            self.table[key] = [(random.random() - 0.5) * 0.1 for _ in range(self.dim)]
-        return self.table[key]
+    @classmethod
+    def from_dict(cls, d: dict) -> "EmbeddingTable":
+        return cls(dim=d["dim"], lr=d["lr"], table=d["table"])
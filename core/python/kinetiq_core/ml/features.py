@@ -1,9 +1,13 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import List
+from typing import List, Optional, Sequence, Union
 
-from ..models import SetLog, ExerciseConfig, UserSettings
+import numpy as np
+
+from ..models import SetLog, ExerciseConfig, UserSettings, Unit
+from ..units import clamp
+from .history import SetHistoryBuffer, _summarize_rpe
 from .state import MLState
 
 
@@ -14,13 +18,22 @@ class HistorySummary:
     rpe_trend_3: float = 0.0
 
 
-def summarize_history(history: List[SetLog]) -> HistorySummary:
-    if not history:
+HistoryLike = Union[List[SetLog], SetHistoryBuffer]
+
+
+def summarize_history(history: HistoryLike) -> HistorySummary:
+    if isinstance(history, SetHistoryBuffer):
+        if history.n == 0:
+            return HistorySummary()
+        last, avg, trend = _summarize_rpe(history.rpe, history.n)
+        return HistorySummary(last_rpe=last, avg_rpe_3=avg, rpe_trend_3=trend)
+    n = min(3, len(history))
+    if n == 0:
         return HistorySummary()
-    recent = history[-3:] if len(history) >= 3 else history
-    last = recent[-1].rpe
-    avg = sum(s.rpe for s in recent) / len(recent)
-    trend = (recent[-1].rpe - recent[0].rpe) if len(recent) >= 2 else 0.0
+    last = history[-1].rpe
+    first = history[-n].rpe
+    avg = sum(history[i].rpe for i in range(-n, 0)) / n
+    trend = (last - first) if n >= 2 else 0.0
     return HistorySummary(last_rpe=last, avg_rpe_3=avg, rpe_trend_3=trend)
 
 
@@ -31,30 +44,53 @@ def make_feature_vector(
     settings: UserSettings,
     proposed_weight: float,
     proposed_reps: int,
-    history: List[SetLog],
-) -> List[float]:
+    history: HistoryLike,
+    out: Optional[np.ndarray] = None,
+    summary: Optional[HistorySummary] = None,
+) -> np.ndarray:
+    """
+    16-dim feature vector. Pass `out` (e.g. state.feat_buf) to fill a reused
+    buffer in place; it is overwritten by the next call, so consume it first.
+    Pass `summary` (summarize_history(history)) to skip recomputing it.
+    """
     rep_min, rep_max = exercise.rep_range
-    h = summarize_history(history)
-
-    u = state.user_embed.get(user_id)         # 4 dims
-    e = state.ex_embed.get(exercise.name)     # 4 dims
-
-    w = proposed_weight / 500.0
-    r = proposed_reps / 30.0
-    rr_min = rep_min / 30.0
-    rr_max = rep_max / 30.0
-
-    last_rpe = h.last_rpe / 10.0
-    avg_rpe = h.avg_rpe_3 / 10.0
-    trend = max(-1.0, min(1.0, h.rpe_trend_3 / 10.0))
-
-    unit_flag = 1.0 if settings.unit.value == "kg" else 0.0
-
-    return [
-        w, r,
-        rr_min, rr_max,
-        last_rpe, avg_rpe, trend,
-        unit_flag,
-        u[0], u[1], u[2], u[3],
-        e[0], e[1], e[2], e[3],
-    ]
+    h = summarize_history(history) if summary is None else summary
+
+    x = np.empty(16, dtype=np.float32) if out is None else out
+    x[0] = proposed_weight / 500.0
+    x[1] = proposed_reps / 30.0
+    x[2] = rep_min / 30.0
+    x[3] = rep_max / 30.0
+
+    x[4] = h.last_rpe / 10.0
+    x[5] = h.avg_rpe_3 / 10.0
+    x[6] = clamp(h.rpe_trend_3 / 10.0, -1.0, 1.0)
+
+    x[7] = 1.0 if settings.unit is Unit.KG else 0.0
+
+    x[8:12] = state.user_embed.get(user_id)       # 4 dims
+    x[12:16] = state.ex_embed.get(exercise.name)  # 4 dims
+    return x
+
+
+def make_feature_matrix(
+    state: MLState,
+    user_id: str,
+    exercise: ExerciseConfig,
+    settings: UserSettings,
+    proposed_weights: Sequence[float],
+    proposed_reps: Sequence[int],
+    history: HistoryLike,
+    summary: Optional[HistorySummary] = None,
+) -> np.ndarray:
+    """
+    One make_feature_vector row per (weight, reps) candidate, shape (K, 16).
+    History/embedding columns are computed once and broadcast; only the
+    weight and reps columns differ between rows.
+    """
+    shared = make_feature_vector(state, user_id, exercise, settings, 0.0, 0, history, summary=summary)
+    X = np.empty((len(proposed_weights), 16), dtype=np.float32)
+    X[:] = shared
+    X[:, 0] = np.asarray(proposed_weights, dtype=float) / 500.0
+    X[:, 1] = np.asarray(proposed_reps, dtype=float) / 30.0
+    return X
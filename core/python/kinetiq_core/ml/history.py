@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from ..models import SetLog
+
+
+class SetHistoryBuffer:
+    """
+    Recent sets as parallel weight/reps/rpe arrays (struct-of-arrays).
+
+    Rows live in arrays of twice the kept length; when they fill up, the newest
+    `keep` rows are moved to the front, so the tail (e.g. rpe[n-3:n]) is always
+    one contiguous slice and appends are amortized O(1).
+    """
+
+    __slots__ = ("keep", "weight", "reps", "rpe", "n", "seen", "last", "source")
+
+    def __init__(self, keep: int = 8):
+        self.keep = keep
+        self.weight = np.empty(2 * keep)
+        self.reps = np.empty(2 * keep, dtype=np.int32)
+        self.rpe = np.empty(2 * keep)
+        self.n = 0          # rows currently stored
+        self.seen = 0       # sets appended since the last reset
+        self.last: Optional[SetLog] = None
+        self.source: Optional[List[SetLog]] = None  # list the buffer was last synced from
+
+    def append(self, s: SetLog) -> None:
+        if self.n == len(self.rpe):
+            k = self.keep
+            self.weight[:k] = self.weight[-k:]
+            self.reps[:k] = self.reps[-k:]
+            self.rpe[:k] = self.rpe[-k:]
+            self.n = k
+        i = self.n
+        self.weight[i] = s.weight
+        self.reps[i] = s.reps
+        self.rpe[i] = s.rpe
+        self.n = i + 1
+        self.seen += 1
+        self.last = s
+
+    def sync(self, history: List[SetLog], end: Optional[int] = None) -> "SetHistoryBuffer":
+        """
+        Bring the buffer up to history[:end], appending only sets it has not seen.
+        Rebuilds from the tail if history no longer extends what was appended.
+        """
+        end = len(history) if end is None else end
+        if self.seen > end or end - self.seen > self.keep or not self._extends(history):
+            self.n = 0
+            self.seen = max(0, end - self.keep)
+            self.last = None
+        self.source = history
+        for i in range(self.seen, end):
+            self.append(history[i])
+        return self
+
+    def _extends(self, history: List[SetLog]) -> bool:
+        """Whether history[:seen] ends with the stored rows."""
+        if not self.seen:
+            return True
+        # Fast path: the same list, still holding the very SetLog appended last
+        if history is self.source and history[self.seen - 1] is self.last:
+            return True
+        # Any other list (or an edited one): compare every stored row by value
+        n = self.n
+        rows = zip(self.weight[:n].tolist(), self.reps[:n].tolist(), self.rpe[:n].tolist())
+        return all(
+            s.weight == w and s.reps == r and s.rpe == e
+            for s, (w, r, e) in zip(history[self.seen - n:self.seen], rows)
+        )
+
+
+def _summarize_rpe(rpe: np.ndarray, n: int, k: int = 3) -> Tuple[float, float, float]:
+    """(last, avg, trend) over the last k of rpe[:n]; n >= 1. Plain floats in one pass."""
+    k = k if n >= k else n
+    tail = rpe[n - k:n].tolist()
+    last = tail[-1]
+    return last, sum(tail) / k, (last - tail[0]) if k >= 2 else 0.0
+
+
+def _fatigue_from_rpe(rpe: np.ndarray, n: int, k: int = 3) -> float:
+    """fatigue_label without building a HistorySummary: 1.0 if RPE rose >= 0.8 over the last k sets."""
+    if n < 2:
+        return 0.0
+    first = rpe[n - k] if n >= k else rpe[0]
+    return 1.0 if float(rpe[n - 1] - first) >= 0.8 else 0.0
@@ -2,11 +2,11 @@ from __future__ import annotations
 
 import math
 from dataclasses import dataclass
-from typing import List
+from typing import Sequence, Union
 
+import numpy as np
 
-def dot(a: List[float], b: List[float]) -> float:
-    return sum(x * y for x, y in zip(a, b))
+Vector = Union[np.ndarray, Sequence[float]]
 
 
 def sigmoid(z: float) -> float:
@@ -24,27 +24,29 @@ class OnlineLinearRegressor:
     l2: float = 1e-4
 
     def __post_init__(self):
-        self.w = [0.0] * self.dim
+        self.w = np.zeros(self.dim, dtype=np.float32)
         self.b = 0.0
 
-    def predict(self, x: List[float]) -> float:
-        return dot(self.w, x) + self.b
+    def predict(self, x: Vector) -> float:
+        return float(self.w @ np.asarray(x, dtype=np.float32) + self.b)
 
-    def update(self, x: List[float], y: float) -> None:
-        y_hat = self.predict(x)
-        err = (y_hat - y)
-        for i in range(self.dim):
-            grad = err * x[i] + self.l2 * self.w[i]
-            self.w[i] -= self.lr * grad
+    def predict_batch(self, X: np.ndarray) -> np.ndarray:
+        """Predictions for K stacked feature rows (K, dim) in one matvec."""
+        return np.asarray(X, dtype=np.float32) @ self.w + self.b
+
+    def update(self, x: Vector, y: float) -> None:
+        x = np.asarray(x, dtype=np.float32)
+        err = self.predict(x) - y
+        self.w -= self.lr * (err * x + self.l2 * self.w)
         self.b -= self.lr * err
 
     def to_dict(self) -> dict:
-        return {"dim": self.dim, "lr": self.lr, "l2": self.l2, "w": self.w, "b": self.b}
+        return {"dim": self.dim, "lr": self.lr, "l2": self.l2, "w": self.w.tolist(), "b": self.b}
 
     @classmethod
     def from_dict(cls, d: dict) -> "OnlineLinearRegressor":
         obj = cls(dim=d["dim"], lr=d["lr"], l2=d["l2"])
-        obj.w = d["w"]
+        obj.w = np.asarray(d["w"], dtype=np.float32)
         obj.b = d["b"]
         return obj
 
@@ -56,26 +58,30 @@ class OnlineLogisticRegressor:
     l2: float = 1e-4
 
     def __post_init__(self):
-        self.w = [0.0] * self.dim
+        self.w = np.zeros(self.dim, dtype=np.float32)
         self.b = 0.0
 
-    def predict_proba(self, x: List[float]) -> float:
-        return sigmoid(dot(self.w, x) + self.b)
+    def predict_proba(self, x: Vector) -> float:
+        return sigmoid(float(self.w @ np.asarray(x, dtype=np.float32)) + self.b)
+
+    def predict_proba_batch(self, X: np.ndarray) -> np.ndarray:
+        """Probabilities for K stacked feature rows (K, dim) in one pass."""
+        z = np.asarray(X, dtype=np.float32) @ self.w + self.b
+        # Branchless, overflow-safe logistic: 1 / (1 + e^-z) = e^(-log(1 + e^-z))
+        return np.exp(-np.logaddexp(0.0, -z))
 
-    def update(self, x: List[float], y01: float) -> None:
-        p = self.predict_proba(x)
-        err = (p - y01)
-        for i in range(self.dim):
-            grad = err * x[i] + self.l2 * self.w[i]
-            self.w[i] -= self.lr * grad
+    def update(self, x: Vector, y01: float) -> None:
+        x = np.asarray(x, dtype=np.float32)
+        err = self.predict_proba(x) - y01
+        self.w -= self.lr * (err * x + self.l2 * self.w)
         self.b -= self.lr * err
 
     def to_dict(self) -> dict:
-        return {"dim": self.dim, "lr": self.lr, "l2": self.l2, "w": self.w, "b": self.b}
+        return {"dim": self.dim, "lr": self.lr, "l2": self.l2, "w": self.w.tolist(), "b": self.b}
 
     @classmethod
     def from_dict(cls, d: dict) -> "OnlineLogisticRegressor":
         obj = cls(dim=d["dim"], lr=d["lr"], l2=d["l2"])
-        obj.w = d["w"]
+        obj.w = np.asarray(d["w"], dtype=np.float32)
         obj.b = d["b"]
         return obj
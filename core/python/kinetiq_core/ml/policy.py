@@ -1,30 +1,58 @@
 from __future__ import annotations
 
+from dataclasses import dataclass
 from typing import List, Tuple
 
-from kinetiq_core.models import SetLog, ExerciseConfig, UserSettings, Suggestion
+import numpy as np
+
+from kinetiq_core.models import ACTION_NAMES, SetLog, ExerciseConfig, UserSettings, Suggestion, Unit
 from kinetiq_core.rpe_rules import suggest_next_set_from_rpe
-from kinetiq_core.units import normalize_display_weight
+from kinetiq_core.units import clamp, normalize_display_weight
 
 from .state import MLState
-from .features import make_feature_vector
-from .calibration import RPECalibration
+from .features import make_feature_matrix, make_feature_vector, summarize_history
 from .readiness import fatigue_label
+from ._policy_kernels import (
+    ADD_REPS,
+    ADD_WEIGHT,
+    LOWER_REPS,
+    BANDIT_ARM_NAMES,
+    BANDIT_ARMS,
+    STAY,
+    _score_candidates,
+)
+
+
+ACTIONS = list(BANDIT_ARM_NAMES)
+
+
+@dataclass(frozen=True)
+class PolicyConfig:
+    """Guardrail and scoring knobs for suggest_next_set_ml."""
+    min_history: int = 6            # fewer logged sets → rules only
+    max_pred_rpe: float = 9.3       # candidates predicted above this are never chosen
+    closeness_width: float = 3.0    # RPE points outside the target zone per unit of closeness lost
+    progress_w_scale: float = 10.0  # weight added per unit of progress reward
+    rep_progress_bonus: float = 0.3
+
+
+SAFE_POLICY = PolicyConfig()
+EXPLORATORY_POLICY = PolicyConfig(min_history=3, max_pred_rpe=10.0)
 
 
-ACTIONS = ["add_weight", "add_reps", "stay", "lower_reps", "lower_weight"]
+# Candidate weight changes in the user's unit
+_WEIGHT_OFFSETS = {
+    Unit.LB: np.array([5.0, 10.0, -5.0]),
+    Unit.KG: np.array([2.5, 5.0, -2.5]),
+}
 
 
-def _weight_candidates(last_weight: float) -> List[float]:
+def _weight_candidates(last_weight: float, unit: Unit = Unit.LB) -> np.ndarray:
     """
-    Candidate weight changes (lb).
+    Candidate weights for the next set.
     Must respect your philosophy: realistic gym jumps.
     """
-    return [
-        last_weight + 5.0,
-        last_weight + 10.0,
-        last_weight - 5.0,
-    ]
+    return last_weight + _WEIGHT_OFFSETS[unit]
 
 
 def suggest_next_set_ml(
@@ -35,6 +63,7 @@ def suggest_next_set_ml(
     settings: UserSettings,
     history: List[SetLog],
     debug: bool = False,
+    config: PolicyConfig = SAFE_POLICY,
 ) -> Suggestion:
     """
     ML-enhanced policy with hard safety guardrails.
@@ -47,6 +76,9 @@ def suggest_next_set_ml(
     ML ONLY:
     - Chooses between reasonable rule-like options
     - Personalizes timing (reps vs weight)
+
+    `config` sets the thresholds above (SAFE_POLICY unless a caller opts in
+    to e.g. EXPLORATORY_POLICY).
     """
 
     # --------------------------------------------------
@@ -55,22 +87,21 @@ def suggest_next_set_ml(
     rpe_min, rpe_max = exercise.target_rpe_range
     rep_min, rep_max = exercise.rep_range
 
-    # Not enough data → rules only
-    if history is None or len(history) < 6:
-        return suggest_next_set_from_rpe(last_set, exercise, settings, debug=debug)
-
-    # Too hard → rules handle deloads
-    if last_set.rpe > rpe_max:
+    # All checked before any ML state is touched:
+    #   not enough data → rules only
+    #   too hard → rules handle deloads
+    #   RPE below 1 → rules validation rejects it
+    if history is None or len(history) < config.min_history or not (1.0 <= last_set.rpe <= rpe_max):
         return suggest_next_set_from_rpe(last_set, exercise, settings, debug=debug)
 
     # --------------------------------------------------
     # Calibration (per exercise)
     # --------------------------------------------------
-    if exercise.name not in state.calibration_by_ex:
-        state.calibration_by_ex[exercise.name] = RPECalibration()
-
     cal = state.calibration_by_ex[exercise.name]
 
+    # Recent sets as arrays, synced up to (not including) the last set to score it first
+    recent = state.history_buffer(user_id, exercise.name).sync(history, end=len(history) - 1)
+
     # Predict RPE for the last performed set
     x_last = make_feature_vector(
         state,
@@ -79,114 +110,94 @@ def suggest_next_set_ml(
         settings,
         last_set.weight,
         last_set.reps,
-        history[:-1],
+        recent,
+        out=state.feat_buf,
     )
 
     pred_last_rpe = state.rpe_model.predict(x_last)
     cal.update(last_set.rpe - pred_last_rpe)
     state.rpe_model.update(x_last, last_set.rpe)
 
-    calibrated_rpe = max(1.0, min(10.0, cal.calibrate(last_set.rpe)))
+    recent.append(history[-1])
+    summary = summarize_history(recent)  # shared by the fatigue label, context and candidates
+
+    calibrated_rpe = clamp(cal.calibrate(last_set.rpe), 1.0, 10.0)
 
     # --------------------------------------------------
     # Readiness model update (self-supervised)
     # --------------------------------------------------
-    fatigue = fatigue_label(history)
+    fatigue = fatigue_label(recent, summary=summary)
     state.readiness_model.update(x_last, fatigue)
 
     # --------------------------------------------------
     # Candidate generation (RULE-LIKE ONLY)
     # --------------------------------------------------
-    candidates: List[Tuple[str, float, int]] = []
-
-    # Weight candidates (always reset to rep_min)
-    for w in _weight_candidates(last_set.weight):
-        if w > 0:
-            candidates.append(("add_weight", w, rep_min))
+    # Weight candidates (always reset to rep_min; all scored as add_weight)
+    w_cand = _weight_candidates(last_set.weight, settings.unit)
+    w_cand = w_cand[w_cand > 0]
 
-    # Rep candidates
+    # Rep candidates at the same weight: (action id, reps)
+    rep_cand: List[Tuple[int, int]] = []
     if last_set.reps < rep_max:
-        candidates.append(("add_reps", last_set.weight, min(rep_max, last_set.reps + 1)))
+        rep_cand.append((ADD_REPS, min(rep_max, last_set.reps + 1)))
 
     if last_set.reps > rep_min:
-        candidates.append(("lower_reps", last_set.weight, max(rep_min, last_set.reps - 1)))
+        rep_cand.append((LOWER_REPS, max(rep_min, last_set.reps - 1)))
 
-    candidates.append(("stay", last_set.weight, last_set.reps))
+    rep_cand.append((STAY, last_set.reps))
+
+    cand_w = np.concatenate([w_cand, np.full(len(rep_cand), float(last_set.weight))])
+    cand_reps = np.array([rep_min] * len(w_cand) + [r for _, r in rep_cand])
+    cand_ids = np.array([ADD_WEIGHT] * len(w_cand) + [a for a, _ in rep_cand])
+
+    X = make_feature_matrix(state, user_id, exercise, settings, cand_w, cand_reps, recent, summary=summary)
 
     # --------------------------------------------------
     # Contextual bandit (preference only, not authority)
     # --------------------------------------------------
-    x_ctx = make_feature_vector(
-        state,
-        user_id,
-        exercise,
-        settings,
-        last_set.weight,
-        last_set.reps,
-        history,
-    )
+    # The context is the last set's (weight, reps) — exactly the "stay" row, always last
+    x_ctx = X[-1]
 
-    preferred_action = state.bandit.choose(ACTIONS, x_ctx, user_key=user_id)
+    # Action codes are ActionCode values; names are only rendered at the end
+    preferred = BANDIT_ARMS[state.bandit.choose_index(BANDIT_ARM_NAMES, x_ctx, user_key=user_id)]
 
     # --------------------------------------------------
     # Score candidates using predicted RPE + rule priorities
     # --------------------------------------------------
-    best = None
-    best_score = -1e9
-    best_pred_rpe = last_set.rpe
-
-    for action, w, reps in candidates:
-        x = make_feature_vector(state, user_id, exercise, settings, w, reps, history)
-        pred_rpe = state.rpe_model.predict(x)
-
-        # HARD STOP: never allow predicted RPE > 9.3
-        if pred_rpe > 9.3:
-            continue
-
-        # Target-zone closeness
-        if pred_rpe < rpe_min:
-            closeness = 1.0 - (rpe_min - pred_rpe) / 3.0
-        elif pred_rpe > rpe_max:
-            closeness = 1.0 - (pred_rpe - rpe_max) / 3.0
-        else:
-            closeness = 1.0
-
-        # Progress reward (weight > reps)
-        progress = 0.0
-        if w > last_set.weight:
-            progress += (w - last_set.weight) / 10.0
-        if reps > last_set.reps:
-            progress += 0.3
-
-        # Penalize unsafe behavior
-        penalty = 0.0
-        if action == "add_weight" and calibrated_rpe >= 8.7:
-            penalty += 0.6
-        if action == "add_reps" and calibrated_rpe >= 9.0:
-            penalty += 0.5
-
-        # Bandit preference (small nudge only)
-        preference = 0.15 if action == preferred_action else 0.0
-
-        score = closeness + progress + preference - penalty
-
-        if score > best_score:
-            best_score = score
-            best = (action, w, reps)
-            best_pred_rpe = pred_rpe
+    pred_rpe = state.rpe_model.predict_batch(X).astype(float)
+
+    i, best_score = _score_candidates(
+        cand_w,
+        cand_reps,
+        pred_rpe,
+        last_set.weight,
+        last_set.reps,
+        rpe_min,
+        rpe_max,
+        calibrated_rpe,
+        preferred,
+        cand_ids,
+        config.max_pred_rpe,
+        config.closeness_width,
+        config.progress_w_scale,
+        config.rep_progress_bonus,
+    )
 
     # If nothing safe → rules
-    if best is None:
+    if i < 0:
         return suggest_next_set_from_rpe(last_set, exercise, settings, debug=debug)
 
+    best_pred_rpe = float(pred_rpe[i])
+
     # --------------------------------------------------
     # Bandit update (expected reward proxy)
     # --------------------------------------------------
-    reward = max(-1.0, min(1.0, best_score - 0.5))
-    state.bandit.update(preferred_action, x_ctx, reward, user_key=user_id)
+    reward = clamp(best_score - 0.5, -1.0, 1.0)
+    state.bandit.update(ACTION_NAMES[preferred], x_ctx, reward, user_key=user_id)
 
-    action, next_weight, next_reps = best
-    next_weight = normalize_display_weight(next_weight, settings.unit)
+    action = ACTION_NAMES[cand_ids[i]]
+    next_weight = normalize_display_weight(float(cand_w[i]), settings.unit)
+    next_reps = int(cand_reps[i])
 
     return Suggestion(
         action=action,
@@ -199,7 +210,7 @@ def suggest_next_set_ml(
         ),
         debug={
             "calibrated_rpe": calibrated_rpe,
-            "preferred_action": preferred_action,
+            "preferred_action": ACTION_NAMES[preferred],
             "predicted_rpe": best_pred_rpe,
             "score": best_score,
         } if debug else None,
@@ -1,11 +1,13 @@
 from __future__ import annotations
 
-from typing import List
+from typing import Optional
 
-from ..models import SetLog
-from .features import summarize_history
+from .features import HistoryLike, HistorySummary, summarize_history
+from .history import SetHistoryBuffer, _fatigue_from_rpe
 
 
-def fatigue_label(history: List[SetLog]) -> float:
-    h = summarize_history(history)
+def fatigue_label(history: HistoryLike, summary: Optional[HistorySummary] = None) -> float:
+    if summary is None and isinstance(history, SetHistoryBuffer):
+        return _fatigue_from_rpe(history.rpe, history.n)
+    h = summarize_history(history) if summary is None else summary
     return 1.0 if h.rpe_trend_3 >= 0.8 else 0.0
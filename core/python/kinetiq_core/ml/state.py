@@ -1,22 +1,27 @@
 from __future__ import annotations
 
+from collections import defaultdict
 from dataclasses import dataclass, field
-from typing import Dict
+from typing import DefaultDict, Dict, Optional, Tuple
+
+import numpy as np
 
 from .calibration import RPECalibration
 from .online_models import OnlineLinearRegressor, OnlineLogisticRegressor
-from .bandit import LinUCBBandit
+from .bandit import LinUCBBandit, make_bandit
 from .embeddings import EmbeddingTable
 from .bayesian_rpe import BayesianRPEPredictor
 from .user_clustering import UserClustering
+from .history import SetHistoryBuffer
 
 
 @dataclass
 class MLState:
     rpe_model: OnlineLinearRegressor = field(default_factory=lambda: OnlineLinearRegressor(dim=16, lr=0.05, l2=1e-4))
     readiness_model: OnlineLogisticRegressor = field(default_factory=lambda: OnlineLogisticRegressor(dim=16, lr=0.05, l2=1e-4))
-    bandit: LinUCBBandit = field(default_factory=lambda: LinUCBBandit(dim=16, alpha=1.5))
-    calibration_by_ex: Dict[str, RPECalibration] = field(default_factory=dict)
+    # Built from bandit_kind when not passed in
+    bandit: Optional[LinUCBBandit] = None
+    calibration_by_ex: DefaultDict[str, RPECalibration] = field(default_factory=lambda: defaultdict(RPECalibration))
     user_embed: EmbeddingTable = field(default_factory=lambda: EmbeddingTable(dim=4))
     ex_embed: EmbeddingTable = field(default_factory=lambda: EmbeddingTable(dim=4))
     bayesian_rpe: BayesianRPEPredictor = field(
@@ -25,3 +30,22 @@ class MLState:
     user_clustering: UserClustering = field(
         default_factory=lambda: UserClustering(k=3, feature_dim=4)
     )
+    # Scratch feature vector reused by the policy's per-candidate scoring
+    feat_buf: np.ndarray = field(default_factory=lambda: np.empty(16, dtype=np.float32))
+    # Recent sets per (user, exercise) as arrays; not serialized, re-synced from history on use
+    history_by_ex: Dict[Tuple[str, str], SetHistoryBuffer] = field(default_factory=dict)
+    # "linucb" or "linear_ts" (Thompson sampling); see bandit.make_bandit
+    bandit_kind: str = LinUCBBandit.kind
+
+    def __post_init__(self):
+        if self.bandit is None:
+            self.bandit = make_bandit(self.bandit_kind, dim=16, alpha=1.5)
+        # Deserialized states pass a plain dict; unseen exercises still get a fresh calibration
+        if not isinstance(self.calibration_by_ex, defaultdict):
+            self.calibration_by_ex = defaultdict(RPECalibration, self.calibration_by_ex)
+
+    def history_buffer(self, user_id: str, exercise: str) -> SetHistoryBuffer:
+        buf = self.history_by_ex.get((user_id, exercise))
+        if buf is None:
+            buf = self.history_by_ex[(user_id, exercise)] = SetHistoryBuffer()
+        return buf
@@ -4,6 +4,8 @@ import math
 from dataclasses import dataclass, field
 from typing import Dict, List, Optional, Tuple
 
+import numpy as np
+
 
 @dataclass
 class UserCluster:
@@ -105,7 +107,7 @@ class UserClustering:
         centroid = self.get_cluster_centroid(cluster_id)
         # Write centroid values directly into the embedding table
         if user_id not in embedding_table.table:
-            embedding_table.table[user_id] = centroid[: embedding_table.dim]
+            embedding_table.table[user_id] = np.asarray(centroid[: embedding_table.dim], dtype=np.float32)
 
     def to_dict(self) -> dict:
         return {
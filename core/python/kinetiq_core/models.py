@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from enum import Enum
+from enum import Enum, IntEnum
 from typing import Tuple, Literal, Optional, Dict, Any, List
 
 
@@ -19,7 +19,20 @@ class FitnessGoal(str, Enum):
 Action = Literal["add_weight", "add_reps", "stay", "lower_weight", "lower_reps"]
 
 
-@dataclass(frozen=True)
+class ActionCode(IntEnum):
+    """Integer form of Action for cheap dispatch; ACTION_NAMES[code] is the string."""
+    STAY = 0
+    ADD_REPS = 1
+    ADD_WEIGHT = 2
+    LOWER_REPS = 3
+    LOWER_WEIGHT = 4
+
+
+ACTION_NAMES: Tuple[Action, ...] = ("stay", "add_reps", "add_weight", "lower_reps", "lower_weight")
+_ACTION_CODES: Dict[str, ActionCode] = {name: ActionCode(i) for i, name in enumerate(ACTION_NAMES)}
+
+
+@dataclass(frozen=True, slots=True)
 class UserSettings:
     """
     Global user settings.
@@ -42,7 +55,7 @@ class UserSettings:
     goal: FitnessGoal = FitnessGoal.BOTH
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ExerciseConfig:
     """
     Per-exercise configuration.
@@ -59,8 +72,14 @@ class ExerciseConfig:
     max_jump_override: Optional[float] = None
     reps_step: int = 1  # typically +1 rep at a time
 
+    def __post_init__(self):
+        # Validated once here, so the per-set path only checks the SetLog
+        rep_min, rep_max = self.rep_range
+        if rep_min < 1 or rep_max < rep_min:
+            raise ValueError(f"Invalid rep_range {self.rep_range}")
+
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class SetLog:
     """
     Single set logged by the user.
@@ -71,7 +90,7 @@ class SetLog:
     rpe: float  # 1–10
 
 
-@dataclass
+@dataclass(slots=True)
 class SetLogWithTs:
     """SetLog with an optional ISO-8601 timestamp string."""
     weight: float
@@ -80,7 +99,7 @@ class SetLogWithTs:
     ts: Optional[str] = None
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class PlateauResult:
     """Result of plateau detection for an exercise."""
     is_plateau: bool
@@ -90,7 +109,7 @@ class PlateauResult:
     explanation: str
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class RPEReliabilityResult:
     """How much to trust the user's RPE readings for this exercise."""
     score: float               # 0.0–1.0 (1.0 = very reliable)
@@ -99,7 +118,7 @@ class RPEReliabilityResult:
     weight_in_decisions: float # 0.3–1.0
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Suggestion:
     action: Action
     next_weight: float
@@ -109,3 +128,7 @@ class Suggestion:
     debug: Optional[Dict[str, Any]] = None
     plateau_info: Optional[PlateauResult] = None
     rpe_reliability: Optional[RPEReliabilityResult] = None
+
+    @property
+    def action_code(self) -> ActionCode:
+        return _ACTION_CODES[self.action]
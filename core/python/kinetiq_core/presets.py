@@ -1,32 +1,45 @@
 from __future__ import annotations
 
+from functools import lru_cache
 from typing import Dict, Optional, Tuple
 
 from .models import ExerciseConfig, UserSettings, Unit
 
 
+def _is_heavy_lower_name(name: str) -> bool:
+    """_is_lower_body_heavy for an already lowercased name."""
+    # "dead" already covers "deadlift"
+    return ("dead" in name) or ("squat" in name)
+
+
+@lru_cache(maxsize=1024)
 def _is_lower_body_heavy(exercise_name: str) -> bool:
-    name = exercise_name.lower()
-    return ("deadlift" in name) or ("dead" in name) or ("squat" in name)
+    return _is_heavy_lower_name(exercise_name.lower())
 
 
-def default_increment_for_exercise(settings: UserSettings, exercise_name: str) -> float:
+def default_increment_for_exercise(
+    settings: UserSettings, exercise_name: str, heavy: Optional[bool] = None
+) -> float:
     """
     Defaults:
     - Squat / Deadlift: 5 lb (or ~2.5 kg)
     - Everything else: 2.5 lb (or ~1.25 kg)
     Returned in the user's unit (lb/kg).
+    `heavy` skips the name check when the caller already knows it.
     """
-    heavy = _is_lower_body_heavy(exercise_name)
+    if heavy is None:
+        heavy = _is_lower_body_heavy(exercise_name)
 
-    if settings.unit == Unit.LB:
+    if settings.unit is Unit.LB:
         return 5.0 if heavy else 2.5
 
     # KG equivalents
     return 2.5 if heavy else 1.25
 
 
-def default_max_jump_for_exercise(settings: UserSettings, exercise_name: str) -> float:
+def default_max_jump_for_exercise(
+    settings: UserSettings, exercise_name: str, heavy: Optional[bool] = None
+) -> float:
     """
     Defaults:
     - Squat / Deadlift: larger allowed jumps
@@ -36,10 +49,12 @@ def default_max_jump_for_exercise(settings: UserSettings, exercise_name: str) ->
       * LB: 10
       * KG: ~5
     Returned in the user's unit (lb/kg).
+    `heavy` skips the name check when the caller already knows it.
     """
-    heavy = _is_lower_body_heavy(exercise_name)
+    if heavy is None:
+        heavy = _is_lower_body_heavy(exercise_name)
 
-    if settings.unit == Unit.LB:
+    if settings.unit is Unit.LB:
         return 15.0 if heavy else 10.0
 
     return 7.5 if heavy else 5.0
@@ -58,8 +73,9 @@ def make_exercise(
     """
     settings = settings or UserSettings(unit=Unit.LB)
 
-    inc = default_increment_for_exercise(settings, name)
-    max_jump = default_max_jump_for_exercise(settings, name)
+    heavy = _is_lower_body_heavy(name)
+    inc = default_increment_for_exercise(settings, name, heavy)
+    max_jump = default_max_jump_for_exercise(settings, name, heavy)
 
     return ExerciseConfig(
         name=name,
@@ -73,9 +89,9 @@ def make_exercise(
 
 _ISOLATION_KEYWORDS = ("curl", "pushdown", "fly", "flye", "extension", "raise", "kickback", "lateral")
 _UPPER_COMPOUND_KEYWORDS = ("bench", "press", "row", "pull")
-_LOWER_HEAVY_KEYWORDS = ("squat", "deadlift", "dead")
 
 
+@lru_cache(maxsize=1024)
 def adaptation_rate_for_exercise(exercise_name: str) -> float:
     """
     Return a multiplier indicating how quickly this exercise tends to adapt.
@@ -90,7 +106,7 @@ def adaptation_rate_for_exercise(exercise_name: str) -> float:
     - Everything else:              1.0
     """
     name = exercise_name.lower()
-    if any(k in name for k in _LOWER_HEAVY_KEYWORDS):
+    if _is_heavy_lower_name(name):
         return 1.3
     if any(k in name for k in _ISOLATION_KEYWORDS):
         return 0.6
@@ -1,7 +1,32 @@
 from __future__ import annotations
 
+from typing import TYPE_CHECKING
+
 from .models import Unit
-from .units import to_kg
+from .units import clamp, to_kg
+
+if TYPE_CHECKING:
+    import numpy as np
+
+
+def _jump_piecewise_lb(rpe: float) -> float:
+    """Piecewise-linear jump for an already clamped RPE (see jump_from_rpe_lb)."""
+    # RPE 1 -> 15, RPE 3 -> 10
+    if rpe <= 3.0:
+        # linear slope: (10-15)/(3-1) = -2.5
+        return 17.5 - 2.5 * rpe
+
+    # RPE 4 -> 10, RPE 7 -> 5
+    if rpe <= 7.0:
+        # slope: (5-10)/(7-4) = -5/3
+        return 10.0 + (rpe - 4.0) * (-5.0 / 3.0)
+
+    # RPE 7–10 stays at 5
+    return 5.0
+
+
+# jump_from_rpe_lb at RPE 1.0, 1.1, ..., 10.0, keyed by the RPE itself
+_JUMP_LB_TABLE = {i / 10.0: _jump_piecewise_lb(i / 10.0) for i in range(10, 101)}
 
 
 def jump_from_rpe_lb(rpe: float) -> float:
@@ -16,20 +41,22 @@ def jump_from_rpe_lb(rpe: float) -> float:
 
     NOTE: This function only applies when the engine has decided to "add_weight".
     """
-    rpe = max(1.0, min(10.0, rpe))
+    # Logged RPEs sit on the 0.1 grid → one dict hit; anything else is evaluated exactly
+    jump = _JUMP_LB_TABLE.get(rpe)
+    if jump is not None:
+        return jump
+    return _jump_piecewise_lb(clamp(rpe, 1.0, 10.0))
 
-    # RPE 1 -> 15, RPE 3 -> 10
-    if rpe <= 3.0:
-        # linear slope: (10-15)/(3-1) = -2.5
-        return 17.5 - 2.5 * rpe
 
-    # RPE 4 -> 10, RPE 7 -> 5
-    if rpe <= 7.0:
-        # slope: (5-10)/(7-4) = -5/3
-        return 10.0 + (rpe - 4.0) * (-5.0 / 3.0)
+def jump_from_rpe_lb_batch(rpes: np.ndarray) -> np.ndarray:
+    """
+    jump_from_rpe_lb over an array of RPEs (e.g. a replayed history), bit-identical per element.
+    Needs NumPy (the `ml` extra); imported here so the core stays dependency-free.
+    """
+    import numpy as np
 
-    # RPE 7–10 stays at 5
-    return 5.0
+    r = np.clip(np.asarray(rpes, dtype=np.float64), 1.0, 10.0)
+    return np.where(r <= 3.0, 17.5 - 2.5 * r, np.where(r <= 7.0, 10.0 + (r - 4.0) * (-5.0 / 3.0), 5.0))
 
 
 def jump_from_rpe(rpe: float, unit: Unit) -> float:
@@ -38,7 +65,7 @@ def jump_from_rpe(rpe: float, unit: Unit) -> float:
     If unit is KG, converts the lb jump to kg.
     """
     jump_lb = jump_from_rpe_lb(rpe)
-    return to_kg(jump_lb, Unit.LB) if unit == Unit.KG else jump_lb
+    return to_kg(jump_lb, Unit.LB) if unit is Unit.KG else jump_lb
 
 
 def rep_delta_from_rpe(rpe: float) -> int:
@@ -48,7 +75,7 @@ def rep_delta_from_rpe(rpe: float) -> int:
     Returns: +3, +2, +1, 0, or -1 reps.
     Caller must clamp suggested reps into the working rep range.
     """
-    rpe = max(1.0, min(10.0, rpe))
+    rpe = clamp(rpe, 1.0, 10.0)
 
     if rpe <= 3.0:
         return 3
@@ -0,0 +1,17 @@
+from .io import (
+    ask_nonempty,
+    ask_unit,
+    ask_int_min,
+    ask_float_min,
+    ask_rpe,
+    ask_rep_range,
+)
+
+__all__ = [
+    "ask_nonempty",
+    "ask_unit",
+    "ask_int_min",
+    "ask_float_min",
+    "ask_rpe",
+    "ask_rep_range",
+]
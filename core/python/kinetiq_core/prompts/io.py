@@ -0,0 +1,126 @@
+"""
+Console prompts shared by the example CLIs.
+
+Each ask_* helper re-asks until it gets a valid answer. When stdin is piped
+(CI, scripted replays) all answers are read in one go and served from a queue.
+"""
+from __future__ import annotations
+
+import re
+import sys
+from collections import deque
+from typing import Deque, Dict, Optional
+
+from ..models import Unit
+
+
+_piped_lines: Optional[Deque[str]] = None
+
+_UNIT_MAP: Dict[str, Unit] = {
+    "lb": Unit.LB,
+    "lbs": Unit.LB,
+    "kg": Unit.KG,
+    "kgs": Unit.KG,
+}
+
+_RANGE_RE = re.compile(r"^\s*(\d+)\s*[-–]\s*(\d+)\s*$")
+
+_KINDS = {
+    "int": (int, "Enter a valid integer."),
+    "float": (float, "Enter a valid number."),
+}
+
+
+def _prompt_stream() -> Optional[Deque[str]]:
+    """
+    When stdin is piped (CI, scripted replays), read it once and serve
+    answers from a queue instead of one readline per prompt.
+    Returns None for an interactive terminal.
+    """
+    global _piped_lines
+    if _piped_lines is None and not sys.stdin.isatty():
+        _piped_lines = deque(sys.stdin.read().splitlines())
+    return _piped_lines
+
+
+def _ask(prompt: str) -> str:
+    lines = _prompt_stream()
+    if lines is None:
+        return input(prompt).strip()
+    sys.stdout.write(prompt)
+    if not lines:
+        raise EOFError("stdin ran out of answers")
+    return lines.popleft().strip()
+
+
+def _parse(line: str, kind: str, lo: float, hi: Optional[float] = None) -> float:
+    """Parse one answer as `kind` within [lo, hi]; raises ValueError with a user-facing message."""
+    cast, invalid = _KINDS[kind]
+    try:
+        v = cast(line)
+    except ValueError:
+        raise ValueError(invalid) from None
+    if hi is not None and not (lo <= v <= hi):
+        raise ValueError(f"Must be between {lo:g} and {hi:g}.")
+    if v < lo:
+        raise ValueError(f"Must be ≥ {lo}.")
+    return v
+
+
+def _ask_parsed(prompt: str, kind: str, lo: float, hi: Optional[float] = None) -> float:
+    while True:
+        try:
+            return _parse(_ask(prompt), kind, lo, hi)
+        except ValueError as e:
+            print(f"❌ {e}\n")
+
+
+def ask_nonempty(prompt: str) -> str:
+    while True:
+        s = _ask(prompt)
+        if s:
+            return s
+        print("❌ Please enter a value.\n")
+
+
+def ask_unit(default: Unit = Unit.LB) -> Unit:
+    while True:
+        s = _ask(f"Units (lb/kg) [{default.value}]: ").lower()
+        if s == "":
+            return default
+        unit = _UNIT_MAP.get(s)
+        if unit is not None:
+            return unit
+        print("❌ Enter 'lb' or 'kg'.\n")
+
+
+def ask_int_min(prompt: str, lo: int) -> int:
+    return _ask_parsed(prompt, "int", lo)
+
+
+def ask_float_min(prompt: str, lo: float) -> float:
+    return _ask_parsed(prompt, "float", lo)
+
+
+def ask_rpe() -> float:
+    return _ask_parsed("How hard was it? RPE (1–10): ", "float", 1.0, 10.0)
+
+
+def ask_rep_range() -> tuple[int, int]:
+    """
+    Accepts "5-8" in a single answer. A bare number is taken as the MIN and
+    only the MAX is asked for; anything else falls back to both prompts.
+    """
+    s = _ask("Rep range (e.g. 5-8): ")
+    m = _RANGE_RE.match(s)
+    if m and int(m.group(1)) >= 1 and int(m.group(2)) >= 1:
+        rep_min, rep_max = int(m.group(1)), int(m.group(2))
+    else:
+        try:
+            rep_min = int(_parse(s, "int", 1))
+        except ValueError:
+            rep_min = ask_int_min("Rep range MIN (>=1): ", 1)
+        rep_max = ask_int_min("Rep range MAX (>=1): ", 1)
+    if rep_max < rep_min:
+        rep_min, rep_max = rep_max, rep_min
+    return rep_min, rep_max
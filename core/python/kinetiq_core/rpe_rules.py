@@ -1,20 +1,24 @@
 from __future__ import annotations
 
-from typing import List, Optional, Tuple
+from functools import lru_cache
+from typing import Callable, List, Literal, Optional, Tuple, Union
 
-from .models import SetLog, ExerciseConfig, UserSettings, Suggestion, Action, FitnessGoal
+from .models import SetLog, ExerciseConfig, UserSettings, Suggestion, FitnessGoal, Unit
 from .presets import adaptation_rate_for_exercise
-from .units import (
-    to_kg, from_kg, round_to_increment, clamp_int,
-    increment_in_kg, max_jump_in_kg, normalize_display_weight
-)
-from .progression import jump_from_rpe, rep_delta_from_rpe
+from .units import display_from_kg, increment_in_kg, max_jump_in_kg, to_kg_f
+from .rpe_rules_kernels import ACTIONS, DECIDERS, REASONS
+from .set_history import HistoryArrays, HistoryIndex
 
+# A set history: SetLogs, the same as columns (set_history.history_arrays),
+# or a per-prescription index of it (set_history.HistoryIndex)
+History = Union[List[SetLog], HistoryArrays, HistoryIndex]
 
-def validate_inputs(last_set: SetLog, cfg: ExerciseConfig) -> None:
-    rep_min, rep_max = cfg.rep_range
-    if rep_min < 1 or rep_max < rep_min:
-        raise ValueError(f"Invalid rep_range {cfg.rep_range}")
+# "jeff_b": reps first, then weight; "weight_first": a too-easy set adds weight right away
+Strategy = Literal["jeff_b", "weight_first"]
+
+
+def validate_inputs(last_set: SetLog, cfg: Optional[ExerciseConfig] = None) -> None:
+    """Per-set checks; cfg.rep_range is already validated when the ExerciseConfig is built."""
     if not (1.0 <= last_set.rpe <= 10.0):
         raise ValueError(f"RPE must be between 1 and 10. Got {last_set.rpe}")
     if last_set.reps < 1:
@@ -23,34 +27,8 @@ def validate_inputs(last_set: SetLog, cfg: ExerciseConfig) -> None:
         raise ValueError("weight must be > 0")
 
 
-def _dynamic_weight_increase_kg(
-    rpe: float,
-    settings: UserSettings,
-    inc_kg: float,
-    max_jump_kg: float,
-    adapt_rate: float = 1.0,
-) -> float:
-    """
-    Compute weight increase amount in kg based on RPE,
-    respecting:
-      - minimum realistic delta (>= 5 lb or >= 2.5 kg)
-      - minimum rounding increment
-      - max jump cap
-      - adapt_rate scales the jump (faster-adapting exercises get larger jumps)
-    """
-    min_delta_user = 5.0 if settings.unit.value == "lb" else 2.5
-    min_delta_kg = to_kg(min_delta_user, settings.unit)
-
-    change_user = jump_from_rpe(rpe, settings.unit)
-    change_kg = to_kg(change_user, settings.unit)
-
-    change_kg = max(change_kg, min_delta_kg, inc_kg)
-    change_kg *= adapt_rate
-    return min(max_jump_kg, change_kg)
-
-
 def _recent_same_prescription_rpes(
-    history: Optional[List[SetLog]],
+    history: Optional[History],
     weight: float,
     reps: int,
     k: int = 3,
@@ -61,9 +39,16 @@ def _recent_same_prescription_rpes(
     """
     if not history:
         return []
+    weight, reps = float(weight), int(reps)
+    if isinstance(history, HistoryIndex):
+        return history.recent(weight, reps, k)
+    if isinstance(history, HistoryArrays):
+        idx = ((history.weight == weight) & (history.reps == reps)).nonzero()[0]
+        return history.rpe[idx[-k:][::-1]].tolist() if len(idx) else []
+    # Coerce the key once; SetLog fields already compare exactly against it (185 == 185.0)
     out: List[float] = []
     for s in reversed(history):
-        if float(s.weight) == float(weight) and int(s.reps) == int(reps):
+        if s.reps == reps and s.weight == weight:
             out.append(float(s.rpe))
             if len(out) >= k:
                 break
@@ -71,7 +56,7 @@ def _recent_same_prescription_rpes(
 
 
 def _should_add_weight_from_rpe_drop(
-    history: Optional[List[SetLog]],
+    history: Optional[History],
     last_set: SetLog,
     drop_threshold: float = 1.0,
     k_baseline: int = 3,
@@ -91,13 +76,20 @@ def _should_add_weight_from_rpe_drop(
     if not history or len(history) < 2:
         return False, ""
 
-    matches = _recent_same_prescription_rpes(history, last_set.weight, last_set.reps, k=k_baseline + 1)
-    if len(matches) < 2:
-        return False, ""
+    if isinstance(history, HistoryIndex) and history.k == k_baseline + 1:
+        # The index keeps the baseline sum per prescription: no matches list needed
+        stats = history.current_and_baseline(last_set.weight, last_set.reps)
+        if stats is None:
+            return False, ""
+        current, baseline = stats
+    else:
+        matches = _recent_same_prescription_rpes(history, last_set.weight, last_set.reps, k=k_baseline + 1)
+        if len(matches) < 2:
+            return False, ""
 
-    current = matches[0]
-    baseline_pool = matches[1:]  # older ones
-    baseline = sum(baseline_pool) / len(baseline_pool)
+        current = matches[0]
+        baseline_pool = matches[1:]  # older ones
+        baseline = sum(baseline_pool) / len(baseline_pool)
 
     improvement = baseline - current
     if improvement >= drop_threshold:
@@ -110,7 +102,8 @@ def suggest_next_set_from_rpe(
     cfg: ExerciseConfig,
     settings: UserSettings,
     debug: bool = False,
-    history: Optional[List[SetLog]] = None,  # ✅ NEW (backwards compatible)
+    history: Optional[History] = None,  # ✅ NEW (backwards compatible)
+    strategy: Strategy = "jeff_b",
 ) -> Suggestion:
     """
     JEFF-STYLE B (Double progression + RPE-drop trigger):
@@ -126,24 +119,66 @@ def suggest_next_set_from_rpe(
     - If RPE too high -> lower weight or reps.
     - Always clamp reps to [rep_min, rep_max].
     - Internal weight math is in kg.
+
+    strategy="weight_first" instead adds weight as soon as a set is too easy.
+    debug=True attaches the inputs/config/outputs dict (suggest_next_set_from_rpe_debug).
+    """
+    return compile_decider(cfg, settings, strategy, debug)(last_set, history)
+
+
+def suggest_next_set_from_rpe_debug(
+    last_set: SetLog,
+    cfg: ExerciseConfig,
+    settings: UserSettings,
+    history: Optional[History] = None,
+    strategy: Strategy = "jeff_b",
+) -> Suggestion:
+    """suggest_next_set_from_rpe with Suggestion.debug filled in."""
+    return compile_decider(cfg, settings, strategy, True)(last_set, history)
+
+
+def compile_decider(
+    cfg: ExerciseConfig,
+    settings: UserSettings,
+    strategy: Strategy = "jeff_b",
+    debug: bool = False,
+    explain: bool = True,
+) -> Callable[..., Suggestion]:
+    """
+    suggest_next_set_from_rpe specialized to one (cfg, settings, strategy):
+    decider(last_set, history=None) -> Suggestion.
+
+    Everything that only depends on cfg/settings (unit, kg increments, goal
+    ceiling, adaptation rate) is resolved once; cached per argument tuple.
+    The production decider never builds the debug dict; debug=True returns
+    the variant that does. explain=False skips formatting the reason text
+    (explanation is ""), for callers that only use the action/weight/reps.
     """
-    validate_inputs(last_set, cfg)
+    # Always positional: lru_cache keys keyword and positional calls apart
+    return _compile_decider(cfg, settings, strategy, debug, explain)
+
+
+@lru_cache(maxsize=64)
+def _compile_decider(
+    cfg: ExerciseConfig,
+    settings: UserSettings,
+    strategy: Strategy,
+    debug: bool,
+    explain: bool,
+) -> Callable[..., Suggestion]:
+    if strategy not in DECIDERS:
+        raise ValueError(f"Unknown strategy {strategy!r}; expected one of {sorted(DECIDERS)}")
+    decide = DECIDERS[strategy]
 
     rep_min, rep_max = cfg.rep_range
     rpe_min, rpe_max = cfg.target_rpe_range
 
-    w_kg = to_kg(last_set.weight, settings.unit)
+    # Convert once on the way in and once on the way out
+    unit = settings.unit
+    unit_is_lb = unit is Unit.LB
     inc_kg = increment_in_kg(settings, cfg.weight_increment_override)
     max_jump_kg = max_jump_in_kg(settings, cfg.max_jump_override)
 
-    reps = int(last_set.reps)
-    rpe = float(last_set.rpe)
-
-    next_w_kg = w_kg
-    next_reps = clamp_int(reps, rep_min, rep_max)
-    action: Action = "stay"
-    reason = ""
-
     # Goal-aware rep ceiling (how aggressively to push reps before adding weight)
     if settings.goal == FitnessGoal.STRENGTH:
         reps_push_ceiling = 7.5   # push weight faster
@@ -155,92 +190,36 @@ def suggest_next_set_from_rpe(
     # Exercise-specific adaptation rate modifies weight jump magnitude
     adapt_rate = adaptation_rate_for_exercise(cfg.name)
 
-    # -----------------------
-    # TOO HARD (safety first)
-    # -----------------------
-    if rpe > rpe_max:
-        if reps <= rep_min:
-            change = min(max_jump_kg, inc_kg)
-            next_w_kg = w_kg - change
-            next_reps = rep_min
-            action = "lower_weight"
-            reason = f"RPE {rpe:.1f} > {rpe_max:.1f} at low reps; reduce weight and reset reps to {rep_min}."
-        else:
-            delta = rep_delta_from_rpe(rpe)  # negative at high RPE
-            next_reps = clamp_int(reps + delta, rep_min, rep_max)
-            action = "lower_reps"
-            reason = f"RPE {rpe:.1f} > {rpe_max:.1f}; reduce reps slightly."
-
-    # -----------------------
-    # TOO EASY (Jeff-style: reps-first, not weight-first)
-    # -----------------------
-    elif rpe < rpe_min:
-        if reps < rep_max:
-            next_reps = clamp_int(reps + 1, rep_min, rep_max)
-            action = "add_reps"
-            reason = f"RPE {rpe:.1f} < {rpe_min:.1f}; add reps first (double progression)."
-        else:
-            change = _dynamic_weight_increase_kg(rpe, settings, inc_kg, max_jump_kg, adapt_rate)
-            next_w_kg = w_kg + change
-            next_reps = rep_min
-            action = "add_weight"
-            reason = f"RPE {rpe:.1f} < {rpe_min:.1f} at rep cap; add weight and reset reps to {rep_min}."
-
-    # -----------------------
-    # IN TARGET RANGE (Jeff-style)
-    # -----------------------
-    else:
-        # Jeff trigger: RPE drop by ~1 for same weight/reps
-        drop_ok, drop_msg = _should_add_weight_from_rpe_drop(history, last_set, drop_threshold=1.0, k_baseline=3)
-
-        # If at rep cap, weight goes up if not too hard
-        if reps >= rep_max:
-            mid = (rpe_min + rpe_max) / 2.0
-            if rpe <= mid or drop_ok:
-                change = _dynamic_weight_increase_kg(rpe, settings, inc_kg, max_jump_kg, adapt_rate)
-                next_w_kg = w_kg + change
-                next_reps = rep_min
-                action = "add_weight"
-                if drop_ok:
-                    reason = f"At rep cap + {drop_msg} → add weight and reset reps to {rep_min}."
-                else:
-                    reason = f"At rep cap with manageable RPE ({rpe:.1f}); add weight and reset reps to {rep_min}."
-            else:
-                action = "stay"
-                next_reps = rep_max
-                reason = f"At rep cap and RPE ({rpe:.1f}) is hard; repeat to solidify."
-
-        # Otherwise: push reps sooner (reps-first within the range)
-        else:
-            if rpe <= reps_push_ceiling:
-                next_reps = clamp_int(reps + 1, rep_min, rep_max)
-                action = "add_reps"
-                reason = f"RPE {rpe:.1f} in target and not near failure; add reps toward {rep_max}."
-            else:
-                action = "stay"
-                next_reps = clamp_int(reps, rep_min, rep_max)
-                reason = f"RPE {rpe:.1f} near top of target; stay to avoid overshooting."
-
-            # If the RPE-drop trigger says it's easier now, allow load increase even before rep_max
-            # (Optional but Jeff-authentic)
-            if drop_ok and rpe <= (rpe_max - 0.2):
-                change = _dynamic_weight_increase_kg(rpe, settings, inc_kg, max_jump_kg, adapt_rate)
-                next_w_kg = w_kg + change
-                next_reps = rep_min
-                action = "add_weight"
-                reason = f"{drop_msg} → add weight early (Jeff-style) and reset reps to {rep_min}."
-
-    # Round + cap jump after rounding
-    next_w_kg = round_to_increment(next_w_kg, inc_kg)
-    if abs(next_w_kg - w_kg) > max_jump_kg:
-        next_w_kg = w_kg + (max_jump_kg if next_w_kg > w_kg else -max_jump_kg)
-        next_w_kg = round_to_increment(next_w_kg, inc_kg)
-
-    next_weight_user = from_kg(next_w_kg, settings.unit)
-    next_weight_user = normalize_display_weight(next_weight_user, settings.unit)
-
-    dbg = None
-    if debug:
+    def step(last_set: SetLog, history: Optional[History]) -> Tuple[float, int, float, int, float, int, str]:
+        """(w_kg, reps, rpe, action_id, next_w_kg, next_reps, reason) for one set."""
+        validate_inputs(last_set)
+
+        w_kg = to_kg_f(last_set.weight, unit_is_lb)
+        reps = int(last_set.reps)
+        rpe = float(last_set.rpe)
+
+        # Jeff trigger: RPE drop by ~1 for same weight/reps (only consulted in the target range)
+        drop_ok, drop_msg = False, ""
+        if rpe_min <= rpe <= rpe_max:
+            drop_ok, drop_msg = _should_add_weight_from_rpe_drop(history, last_set, drop_threshold=1.0, k_baseline=3)
+
+        action_id, next_w_kg, next_reps, reason_id = decide(
+            w_kg, reps, rpe, rep_min, rep_max, rpe_min, rpe_max,
+            inc_kg, max_jump_kg, reps_push_ceiling, adapt_rate,
+            unit_is_lb, drop_ok,
+        )
+        reason = REASONS[reason_id].format(
+            rpe=rpe, rpe_min=rpe_min, rpe_max=rpe_max, rep_min=rep_min, rep_max=rep_max, drop_msg=drop_msg
+        ) if explain else ""
+        return w_kg, reps, rpe, action_id, next_w_kg, next_reps, reason
+
+    def decider(last_set: SetLog, history: Optional[History] = None) -> Suggestion:
+        _, _, _, action_id, next_w_kg, next_reps, reason = step(last_set, history)
+        return Suggestion(ACTIONS[action_id], display_from_kg(next_w_kg, unit), next_reps, unit, reason)
+
+    def debug_decider(last_set: SetLog, history: Optional[History] = None) -> Suggestion:
+        w_kg, reps, rpe, action_id, next_w_kg, next_reps, reason = step(last_set, history)
+        next_weight_user = display_from_kg(next_w_kg, unit)
         dbg = {
             "inputs": {"weight_user": last_set.weight, "weight_kg": w_kg, "reps": reps, "rpe": rpe},
             "config": {
@@ -248,16 +227,36 @@ def suggest_next_set_from_rpe(
                 "target_rpe_range": cfg.target_rpe_range,
                 "inc_kg": inc_kg,
                 "max_jump_kg": max_jump_kg,
-                "unit": settings.unit.value,
+                "unit": unit.value,
             },
             "outputs": {"next_weight_kg": next_w_kg, "next_weight_user": next_weight_user, "next_reps": next_reps},
         }
+        return Suggestion(
+            action=ACTIONS[action_id],
+            next_weight=next_weight_user,
+            next_reps=next_reps,
+            unit=unit,
+            explanation=reason,
+            debug=dbg
+        )
+
+    return debug_decider if debug else decider
 
-    return Suggestion(
-        action=action,
-        next_weight=next_weight_user,
-        next_reps=next_reps,
-        unit=settings.unit,
-        explanation=reason,
-        debug=dbg
-    )
+
+def replay_log(
+    history: HistoryArrays, cfg: ExerciseConfig, settings: UserSettings, explain: bool = True
+) -> List[Suggestion]:
+    """
+    The suggestion after every set of a logged history (backtesting / "simulate my log").
+    Set i sees history[:i + 1]; the sets go into a HistoryIndex one at a time,
+    so each step's RPE-drop lookup is O(1) and the whole replay is O(N).
+    explain=False skips the per-set reason text.
+    """
+    decider = compile_decider(cfg, settings, "jeff_b", False, explain)
+    index = HistoryIndex()
+    out: List[Suggestion] = []
+    for w, reps, rpe in zip(history.weight.tolist(), history.reps.tolist(), history.rpe.tolist()):
+        last = SetLog(w, reps, rpe)
+        index.append(last)
+        out.append(decider(last, history=index))
+    return out
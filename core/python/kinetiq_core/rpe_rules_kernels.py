@@ -0,0 +1,163 @@
+"""
+Numeric core of the Jeff-style B rules: plain floats/ints in, plain floats/ints out.
+
+The deciders built by rpe_rules.compile_decider keep validation, the
+history-based RPE-drop trigger, unit conversion and Suggestion construction;
+_decide only does the branchy arithmetic, so it never touches
+SetLog/ExerciseConfig/UserSettings.
+"""
+from __future__ import annotations
+
+from typing import Callable, Dict, Tuple
+
+from .models import ACTION_NAMES, Action, ActionCode
+from .progression import jump_from_rpe_lb, rep_delta_from_rpe
+from .units import KG_PER_LB, clamp, clamp_int, round_to_increment
+
+# action_id -> Action; ids are the models.ActionCode values, kept as plain ints here
+ACTIONS: Tuple[Action, ...] = ACTION_NAMES
+STAY, ADD_REPS, ADD_WEIGHT, LOWER_REPS, LOWER_WEIGHT = (
+    int(ActionCode.STAY),
+    int(ActionCode.ADD_REPS),
+    int(ActionCode.ADD_WEIGHT),
+    int(ActionCode.LOWER_REPS),
+    int(ActionCode.LOWER_WEIGHT),
+)
+
+# reason_id -> explanation template (formatted by the caller)
+REASONS: Tuple[str, ...] = (
+    "RPE {rpe:.1f} > {rpe_max:.1f} at low reps; reduce weight and reset reps to {rep_min}.",
+    "RPE {rpe:.1f} > {rpe_max:.1f}; reduce reps slightly.",
+    "RPE {rpe:.1f} < {rpe_min:.1f}; add reps first (double progression).",
+    "RPE {rpe:.1f} < {rpe_min:.1f} at rep cap; add weight and reset reps to {rep_min}.",
+    "At rep cap + {drop_msg} → add weight and reset reps to {rep_min}.",
+    "At rep cap with manageable RPE ({rpe:.1f}); add weight and reset reps to {rep_min}.",
+    "At rep cap and RPE ({rpe:.1f}) is hard; repeat to solidify.",
+    "RPE {rpe:.1f} in target and not near failure; add reps toward {rep_max}.",
+    "RPE {rpe:.1f} near top of target; stay to avoid overshooting.",
+    "{drop_msg} → add weight early (Jeff-style) and reset reps to {rep_min}.",
+    "RPE {rpe:.1f} < {rpe_min:.1f}; add weight first and reset reps to {rep_min}.",
+)
+
+
+def _weight_increase_kg(
+    rpe: float,
+    unit_is_lb: bool,
+    inc_kg: float,
+    max_jump_kg: float,
+    adapt_rate: float,
+) -> float:
+    """
+    Weight increase in kg based on RPE, respecting:
+      - minimum realistic delta (>= 5 lb or >= 2.5 kg)
+      - minimum rounding increment
+      - max jump cap
+      - adapt_rate scales the jump (faster-adapting exercises get larger jumps)
+    """
+    min_delta_kg = 5.0 * KG_PER_LB if unit_is_lb else 2.5
+    change_kg = max(jump_from_rpe_lb(rpe) * KG_PER_LB, min_delta_kg, inc_kg)
+    change_kg *= adapt_rate
+    return min(max_jump_kg, change_kg)
+
+
+def _decide(
+    w_kg: float,
+    reps: int,
+    rpe: float,
+    rep_min: int,
+    rep_max: int,
+    rpe_min: float,
+    rpe_max: float,
+    inc_kg: float,
+    max_jump_kg: float,
+    reps_push_ceiling: float,
+    adapt_rate: float,
+    unit_is_lb: bool,
+    drop_ok: bool,
+) -> Tuple[int, float, int, int]:
+    """Returns (action_id, next_w_kg, next_reps, reason_id); next_w_kg is rounded and jump-capped."""
+    next_w_kg = w_kg
+    next_reps = clamp_int(reps, rep_min, rep_max)
+
+    # TOO HARD (safety first)
+    if rpe > rpe_max:
+        if reps <= rep_min:
+            next_w_kg = w_kg - min(max_jump_kg, inc_kg)
+            next_reps = rep_min
+            action, reason = LOWER_WEIGHT, 0
+        else:
+            next_reps = clamp_int(reps + rep_delta_from_rpe(rpe), rep_min, rep_max)
+            action, reason = LOWER_REPS, 1
+
+    # TOO EASY (Jeff-style: reps-first, not weight-first)
+    elif rpe < rpe_min:
+        if reps < rep_max:
+            next_reps = clamp_int(reps + 1, rep_min, rep_max)
+            action, reason = ADD_REPS, 2
+        else:
+            next_w_kg = w_kg + _weight_increase_kg(rpe, unit_is_lb, inc_kg, max_jump_kg, adapt_rate)
+            next_reps = rep_min
+            action, reason = ADD_WEIGHT, 3
+
+    # IN TARGET RANGE (Jeff-style)
+    elif reps >= rep_max:
+        # At rep cap, weight goes up if not too hard (or the RPE-drop trigger fired)
+        if rpe <= (rpe_min + rpe_max) / 2.0 or drop_ok:
+            next_w_kg = w_kg + _weight_increase_kg(rpe, unit_is_lb, inc_kg, max_jump_kg, adapt_rate)
+            next_reps = rep_min
+            action, reason = ADD_WEIGHT, (4 if drop_ok else 5)
+        else:
+            next_reps = rep_max
+            action, reason = STAY, 6
+    else:
+        # Push reps sooner (reps-first within the range)
+        if rpe <= reps_push_ceiling:
+            next_reps = clamp_int(reps + 1, rep_min, rep_max)
+            action, reason = ADD_REPS, 7
+        else:
+            action, reason = STAY, 8
+
+        # If the RPE-drop trigger says it's easier now, allow load increase even before rep_max
+        if drop_ok and rpe <= (rpe_max - 0.2):
+            next_w_kg = w_kg + _weight_increase_kg(rpe, unit_is_lb, inc_kg, max_jump_kg, adapt_rate)
+            next_reps = rep_min
+            action, reason = ADD_WEIGHT, 9
+
+    return action, _round_and_cap(next_w_kg, w_kg, inc_kg, max_jump_kg), next_reps, reason
+
+
+def _decide_weight_first(
+    w_kg: float,
+    reps: int,
+    rpe: float,
+    rep_min: int,
+    rep_max: int,
+    rpe_min: float,
+    rpe_max: float,
+    inc_kg: float,
+    max_jump_kg: float,
+    reps_push_ceiling: float,
+    adapt_rate: float,
+    unit_is_lb: bool,
+    drop_ok: bool,
+) -> Tuple[int, float, int, int]:
+    """Like _decide, but a too-easy set adds weight (and resets reps) even below rep_max."""
+    if rpe < rpe_min:
+        next_w_kg = w_kg + _weight_increase_kg(rpe, unit_is_lb, inc_kg, max_jump_kg, adapt_rate)
+        return ADD_WEIGHT, _round_and_cap(next_w_kg, w_kg, inc_kg, max_jump_kg), rep_min, 10
+    return _decide(
+        w_kg, reps, rpe, rep_min, rep_max, rpe_min, rpe_max,
+        inc_kg, max_jump_kg, reps_push_ceiling, adapt_rate, unit_is_lb, drop_ok,
+    )
+
+
+def _round_and_cap(next_w_kg: float, w_kg: float, inc_kg: float, max_jump_kg: float) -> float:
+    """Clip the jump to +/- max_jump_kg, then round to the increment grid (one round, no branch)."""
+    return round_to_increment(w_kg + clamp(next_w_kg - w_kg, -max_jump_kg, max_jump_kg), inc_kg)
+
+
+# strategy name -> decision kernel (same signature)
+DECIDERS: Dict[str, Callable[..., Tuple[int, float, int, int]]] = {
+    "jeff_b": _decide,
+    "weight_first": _decide_weight_first,
+}
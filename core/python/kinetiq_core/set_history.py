@@ -0,0 +1,103 @@
+"""
+In-memory set-history structures the rules engine can read instead of a SetLog list.
+
+HistoryArrays holds a history as columns (for vectorized scans and replay);
+HistoryIndex buckets it by (weight, reps) for the RPE-drop trigger.
+"""
+from __future__ import annotations
+
+from collections import deque
+from itertools import islice
+from typing import Any, Deque, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from .models import SetLog
+
+
+class HistoryArrays:
+    """
+    A set history as parallel weight/reps/rpe columns (oldest first).
+    len() is the number of sets; prefix(n) is a view of the first n.
+    """
+
+    __slots__ = ("weight", "reps", "rpe")
+
+    def __init__(self, weight, reps, rpe):
+        self.weight = weight
+        self.reps = reps
+        self.rpe = rpe
+
+    def __len__(self) -> int:
+        return len(self.rpe)
+
+    def prefix(self, n: int) -> "HistoryArrays":
+        return HistoryArrays(self.weight[:n], self.reps[:n], self.rpe[:n])
+
+
+def history_arrays(logs: Sequence[Union[SetLog, Dict[str, Any]]]) -> HistoryArrays:
+    """
+    Column arrays for SetLogs or load_logs() entries, for vectorized history scans.
+    Needs NumPy (the `ml` extra); imported here so the core stays dependency-free.
+    """
+    import numpy as np
+
+    rows = [(e["weight"], e["reps"], e["rpe"]) if isinstance(e, dict) else (e.weight, e.reps, e.rpe) for e in logs]
+    return HistoryArrays(
+        np.array([r[0] for r in rows], dtype=np.float64),
+        np.array([r[1] for r in rows], dtype=np.int64),
+        np.array([r[2] for r in rows], dtype=np.float64),
+    )
+
+
+class HistoryIndex:
+    """
+    The last k RPEs per (weight, reps) prescription, most recent first.
+
+    Built once from a history and updated with append(), so the RPE-drop
+    trigger's same-prescription lookup is one dict hit instead of a scan.
+    Each bucket also keeps the sum of its older RPEs (all but the newest),
+    so the trigger's baseline mean is O(1) per query. len() is the number
+    of sets appended.
+    """
+
+    __slots__ = ("k", "n", "_buckets")
+
+    def __init__(self, k: int = 4):
+        self.k = k
+        self.n = 0
+        # (weight, reps) -> [rpes newest first, sum of rpes[1:]]
+        self._buckets: Dict[Tuple[float, int], List[Any]] = {}
+
+    @classmethod
+    def from_logs(cls, logs: Iterable[SetLog], k: int = 4) -> "HistoryIndex":
+        index = cls(k)
+        for s in logs:
+            index.append(s)
+        return index
+
+    def __len__(self) -> int:
+        return self.n
+
+    def append(self, s: SetLog) -> None:
+        key = (float(s.weight), int(s.reps))
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = [deque(maxlen=self.k), 0.0]
+        rpes: Deque[float] = bucket[0]
+        rpes.appendleft(float(s.rpe))
+        # Re-summed (k - 1 adds) rather than add/evict-subtract: no drift, and the same
+        # float result as summing the older matches at query time
+        bucket[1] = sum(islice(rpes, 1, None))
+        self.n += 1
+
+    def recent(self, weight: float, reps: int, k: int) -> List[float]:
+        """Up to min(k, self.k) RPEs logged at (weight, reps), most recent first."""
+        bucket = self._buckets.get((float(weight), int(reps)))
+        return list(islice(bucket[0], k)) if bucket else []
+
+    def current_and_baseline(self, weight: float, reps: int) -> Optional[Tuple[float, float]]:
+        """(newest RPE, mean of the up to k-1 older ones) at (weight, reps); None below 2 sets."""
+        bucket = self._buckets.get((float(weight), int(reps)))
+        if bucket is None or len(bucket[0]) < 2:
+            return None
+        rpes, older_sum = bucket
+        return rpes[0], older_sum / (len(rpes) - 1)
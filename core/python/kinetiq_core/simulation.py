@@ -0,0 +1,139 @@
+"""
+Simulated lifter for the example scripts and benchmarks (examples/plot_progress.py).
+
+SimLifter turns a prescription into the RPE a lifter would report and adapts
+its strength after each session; SimTable stores a run column-wise.
+Needs NumPy (the `ml`/`dev` extras); the package root never imports it.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from functools import partial
+from typing import Callable, Optional
+
+import numpy as np
+
+TARGET_RPE_RANGE = (7.0, 9.0)
+
+
+def _rpe(
+    base_strength: float,
+    sensitivity_weight: float,
+    sensitivity_reps: float,
+    weight: float,
+    reps: int,
+    rep_min: int,
+    offset: float,
+) -> float:
+    rpe = 7.0 + (weight - base_strength) * sensitivity_weight + (reps - rep_min) * sensitivity_reps + offset
+    return max(1.0, min(10.0, rpe))
+
+
+def _adapt(session_rpes: np.ndarray, lo: float, hi: float, good: float, bad: float) -> float:
+    """Change in base strength after a session: `good` if >=60% of sets landed in [lo, hi]."""
+    rate = float(((session_rpes >= lo) & (session_rpes <= hi)).mean())
+    return good if rate >= 0.60 else bad
+
+
+@dataclass(slots=True)
+class SimLifter:
+    base_strength: float = 185.0
+    sensitivity_weight: float = 1.0 / 25.0
+    sensitivity_reps: float = 1.0 / 2.5
+
+    fatigue_per_set: float = 0.18
+    readiness_noise: float = 0.60
+    rpe_noise: float = 0.25
+
+    adapt_good: float = 0.60
+    adapt_bad: float = 0.10
+
+    seed: Optional[int] = None
+    _rng: np.random.Generator = field(init=False, repr=False)
+
+    # _rpe with the current constants bound (see compile_rpe)
+    rpe_fn: Callable[[float, int, int, float], float] = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self._rng = np.random.default_rng(self.seed)
+        self.rpe_fn = self.compile_rpe()
+
+    def compile_rpe(self) -> Callable[[float, int, int, float], float]:
+        """
+        _rpe with this lifter's constants pre-bound, so a call skips the
+        attribute loads of rpe_for_set. Stale once base_strength changes;
+        adapt_after_session recompiles it.
+        """
+        return partial(_rpe, self.base_strength, self.sensitivity_weight, self.sensitivity_reps)
+
+    def sample_offsets(self, weeks: int, sessions: int, sets: int) -> np.ndarray:
+        """
+        Part of every set's RPE that doesn't depend on the prescription:
+        fatigue from earlier sets, day readiness and per-set jitter.
+
+        Drawn in two bulk calls; returns shape (weeks, sessions, sets).
+        """
+        day_readiness = self._rng.uniform(-self.readiness_noise, self.readiness_noise, size=(weeks, sessions))
+        rpe_jitter = self._rng.uniform(-self.rpe_noise, self.rpe_noise, size=(weeks, sessions, sets))
+        fatigue = np.arange(sets) * self.fatigue_per_set
+        return fatigue - day_readiness[..., None] + rpe_jitter
+
+    def rpe_for_set(
+        self,
+        weight: float,
+        reps: int,
+        rep_min: int,
+        offset: float,
+    ) -> float:
+        return _rpe(
+            self.base_strength, self.sensitivity_weight, self.sensitivity_reps,
+            weight, reps, rep_min, offset,
+        )
+
+    def adapt_after_session(self, session_rpes: np.ndarray) -> None:
+        if len(session_rpes) == 0:
+            return
+        lo, hi = TARGET_RPE_RANGE
+        self.base_strength += _adapt(session_rpes, lo, hi, self.adapt_good, self.adapt_bad)
+        self.rpe_fn = self.compile_rpe()
+
+
+@dataclass(slots=True)
+class SimTable:
+    """
+    Every simulated set, stored column-wise (one contiguous array per field)
+    so plotting reads arrays directly instead of walking per-set objects.
+    """
+    week: np.ndarray
+    session_in_week: np.ndarray
+    set_in_session: np.ndarray
+    global_set: np.ndarray
+
+    weight: np.ndarray
+    reps: np.ndarray
+    rpe: np.ndarray
+
+    action: np.ndarray
+    next_weight: np.ndarray
+    next_reps: np.ndarray
+
+    @classmethod
+    def allocate(cls, weeks: int, sessions: int, sets: int) -> "SimTable":
+        """Preallocate all columns; the schedule columns are filled in up front."""
+        n = weeks * sessions * sets
+        idx = np.arange(n)
+        return cls(
+            week=idx // (sessions * sets) + 1,
+            session_in_week=idx // sets % sessions + 1,
+            set_in_session=idx % sets + 1,
+            global_set=idx + 1,
+            weight=np.empty(n),
+            reps=np.empty(n, dtype=np.int32),
+            rpe=np.empty(n),
+            action=np.empty(n, dtype=object),
+            next_weight=np.empty(n),
+            next_reps=np.empty(n, dtype=np.int32),
+        )
+
+    def __len__(self) -> int:
+        return len(self.global_set)
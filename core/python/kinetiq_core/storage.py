@@ -1,15 +1,40 @@
 from __future__ import annotations
 
 import json
-from dataclasses import asdict
+import mmap
+import os
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import Any, Dict, Iterable, List
 
 from .models import SetLog
 
+# Logs at least this large are read through mmap instead of a buffered file.
+_MMAP_MIN_BYTES = 64 * 1024
+
+try:  # optional C-accelerated codec (`fast` extra); the stdlib is the fallback
+    import orjson
+
+    _loads = orjson.loads
+
+    def _dumps_line(obj: Dict[str, Any]) -> bytes:
+        return orjson.dumps(obj) + b"\n"
+except ImportError:
+    _loads = json.loads
+
+    def _dumps_line(obj: Dict[str, Any]) -> bytes:
+        return (json.dumps(obj) + "\n").encode("utf-8")
+
 
 def default_log_path() -> Path:
-    return Path("data") / "set_logs.json"
+    """
+    data/set_logs.jsonl, or a legacy data/set_logs.json while no .jsonl log
+    exists yet (so existing logs are not silently ignored).
+    """
+    path = Path("data") / "set_logs.jsonl"
+    legacy = path.with_suffix(".json")
+    if not path.exists() and legacy.exists():
+        return legacy
+    return path
 
 
 def ensure_parent(path: Path) -> None:
@@ -23,24 +48,53 @@ def load_logs(path: Path | None = None) -> Dict[str, List[Dict[str, Any]]]:
         "bench_press": [{"weight":..., "reps":..., "rpe":..., "ts":...}, ...],
         ...
       }
+
+    The log is JSON Lines, one {"exercise": ..., **entry} object per set.
+    A legacy *.json file (the whole dict above in one document) is still read.
     """
     path = path or default_log_path()
     if not path.exists():
         return {}
-    with path.open("r", encoding="utf-8") as f:
-        return json.load(f)
+    with path.open("rb") as f:
+        if path.suffix == ".json":
+            return _loads(f.read())
+        # Large logs are read straight from a read-only mapping (the OS pages it in)
+        # instead of through the file buffer; below this size mmap setup is not worth it
+        if os.fstat(f.fileno()).st_size < _MMAP_MIN_BYTES:
+            return _group_entries(f)
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+            return _group_entries(iter(m.readline, b""))
+
+
+def _group_entries(lines: Iterable[bytes]) -> Dict[str, List[Dict[str, Any]]]:
+    data: Dict[str, List[Dict[str, Any]]] = {}
+    for line in lines:
+        if line.strip():
+            entry = _loads(line)
+            data.setdefault(entry.pop("exercise"), []).append(entry)
+    return data
 
 
 def append_log(exercise: str, entry: Dict[str, Any], path: Path | None = None) -> None:
+    """
+    Append one set as a single JSON line: O(1) regardless of log size.
+    Legacy *.json logs fall back to a full read-modify-write.
+    """
     path = path or default_log_path()
     ensure_parent(path)
-    data = load_logs(path)
-    data.setdefault(exercise, []).append(entry)
-    with path.open("w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2)
+    if path.suffix == ".json":
+        data = load_logs(path)
+        data.setdefault(exercise, []).append(entry)
+        with path.open("w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+        return
+    with path.open("ab") as f:
+        f.write(_dumps_line({"exercise": exercise, **entry}))
 
 
 def setlog_to_entry(log: SetLog, ts: str) -> Dict[str, Any]:
-    d = asdict(log)
-    d["ts"] = ts
-    return d
+    """
+    The log entry for one set; this is the serializer of record for SetLog,
+    so a new SetLog field has to be added here too (asdict() is avoided on the append path).
+    """
+    return {"weight": log.weight, "reps": log.reps, "rpe": log.rpe, "ts": ts}
@@ -1,25 +1,57 @@
 from __future__ import annotations
 
+from functools import lru_cache
+from math import floor
+
 from .models import Unit, UserSettings
 
 LB_PER_KG = 2.2046226218
+KG_PER_LB = 1.0 / LB_PER_KG
+
+# unit -> multiplier, so conversions are one lookup + one multiply
+_TO_KG_FACTOR = {Unit.LB: KG_PER_LB, Unit.KG: 1.0}
+_FROM_KG_FACTOR = {Unit.LB: LB_PER_KG, Unit.KG: 1.0}
 
 
 def to_kg(weight: float, unit: Unit) -> float:
-    return weight / LB_PER_KG if unit == Unit.LB else weight
+    return weight * _TO_KG_FACTOR[unit]
 
 
 def from_kg(weight_kg: float, unit: Unit) -> float:
-    return weight_kg * LB_PER_KG if unit == Unit.LB else weight_kg
+    return weight_kg * _FROM_KG_FACTOR[unit]
+
+
+def to_kg_f(weight: float, is_lb: bool) -> float:
+    """to_kg for plain-float kernels that carry the unit as a bool."""
+    return weight * KG_PER_LB if is_lb else weight
 
 
 def round_to_increment(x: float, inc: float) -> float:
-    inc = max(1e-9, inc)
-    return round(x / inc) * inc
+    """Nearest multiple of inc; exact halves round up."""
+    inc = inc if inc > 1e-9 else 1e-9
+    return floor(x * (1.0 / inc) + 0.5) * inc
+
+
+def clamp(x: float, lo: float, hi: float) -> float:
+    """Same result as max(lo, min(hi, x)), without the builtin min/max call overhead."""
+    x = x if x < hi else hi
+    return x if x > lo else lo
 
 
 def clamp_int(x: int, lo: int, hi: int) -> int:
-    return max(lo, min(hi, x))
+    x = x if x < hi else hi
+    return x if x > lo else lo
+
+
+# Keyed on primitives (not the settings object), so edits to UserSettings are picked up.
+@lru_cache(maxsize=64)
+def _inc_kg_cached(is_lb: bool, lb_increment: float, kg_increment: float) -> float:
+    return to_kg(lb_increment, Unit.LB) if is_lb else kg_increment
+
+
+@lru_cache(maxsize=64)
+def _max_jump_kg_cached(is_lb: bool, max_jump_lb: float, max_jump_kg: float) -> float:
+    return to_kg(max_jump_lb, Unit.LB) if is_lb else max_jump_kg
 
 
 def increment_in_kg(settings: UserSettings, override: float | None = None) -> float:
@@ -29,10 +61,7 @@ def increment_in_kg(settings: UserSettings, override: float | None = None) -> fl
     """
     if override is not None:
         return to_kg(override, settings.unit)
-
-    if settings.unit == Unit.LB:
-        return to_kg(settings.lb_increment, Unit.LB)
-    return settings.kg_increment
+    return _inc_kg_cached(settings.unit is Unit.LB, settings.lb_increment, settings.kg_increment)
 
 
 def max_jump_in_kg(settings: UserSettings, override: float | None = None) -> float:
@@ -42,10 +71,7 @@ def max_jump_in_kg(settings: UserSettings, override: float | None = None) -> flo
     """
     if override is not None:
         return to_kg(override, settings.unit)
-
-    if settings.unit == Unit.LB:
-        return to_kg(settings.max_jump_lb, Unit.LB)
-    return settings.max_jump_kg
+    return _max_jump_kg_cached(settings.unit is Unit.LB, settings.max_jump_lb, settings.max_jump_kg)
 
 
 def normalize_display_weight(weight: float, unit: Unit) -> float:
@@ -53,8 +79,15 @@ def normalize_display_weight(weight: float, unit: Unit) -> float:
     Just for display niceness (avoid 184.999999).
     Does not affect internal logic.
     """
-    if unit == Unit.LB:
+    if unit is Unit.LB:
         # show to nearest 0.5 lb (common)
         return round(weight * 2) / 2
     # show to nearest 0.25 kg (common)
     return round(weight * 4) / 4
+
+
+def display_from_kg(weight_kg: float, unit: Unit) -> float:
+    """normalize_display_weight(from_kg(weight_kg, unit), unit) with a single unit check."""
+    if unit is Unit.LB:
+        return round(weight_kg * LB_PER_KG * 2) / 2
+    return round(weight_kg * 4) / 4
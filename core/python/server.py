@@ -52,27 +52,13 @@ def _serialize_ml_state(state: MLState) -> Dict[str, Any]:
     return {
         "rpe_model": state.rpe_model.to_dict(),
         "readiness_model": state.readiness_model.to_dict(),
-        "bandit": {
-            "dim": state.bandit.dim,
-            "alpha": state.bandit.alpha,
-            "Ainv": state.bandit.Ainv,
-            "b": state.bandit.b,
-            "action_history": state.bandit.action_history,
-        },
+        "bandit": state.bandit.to_dict(),
         "calibration_by_ex": {
             k: {"n": v.n, "bias": v.bias, "m2": v.m2}
             for k, v in state.calibration_by_ex.items()
         },
-        "user_embed": {
-            "dim": state.user_embed.dim,
-            "lr": state.user_embed.lr,
-            "table": state.user_embed.table,
-        },
-        "ex_embed": {
-            "dim": state.ex_embed.dim,
-            "lr": state.ex_embed.lr,
-            "table": state.ex_embed.table,
-        },
+        "user_embed": state.user_embed.to_dict(),
+        "ex_embed": state.ex_embed.to_dict(),
         "bayesian_rpe": state.bayesian_rpe.to_dict(),
         "user_clustering": state.user_clustering.to_dict(),
     }
@@ -82,22 +68,15 @@ def _deserialize_ml_state(d: Dict[str, Any]) -> MLState:
     rpe_model = OnlineLinearRegressor.from_dict(d["rpe_model"])
     readiness_model = OnlineLogisticRegressor.from_dict(d["readiness_model"])
 
-    bandit_d = d["bandit"]
-    bandit = LinUCBBandit(dim=bandit_d["dim"], alpha=bandit_d["alpha"])
-    bandit.Ainv = bandit_d["Ainv"]
-    bandit.b = bandit_d["b"]
-    bandit.action_history = bandit_d.get("action_history", {})
+    bandit = LinUCBBandit.from_dict(d["bandit"])
 
     calibration_by_ex = {
         k: RPECalibration(n=v["n"], bias=v["bias"], m2=v["m2"])
         for k, v in d.get("calibration_by_ex", {}).items()
     }
 
-    ue_d = d["user_embed"]
-    user_embed = EmbeddingTable(dim=ue_d["dim"], lr=ue_d["lr"], table=ue_d["table"])
-
-    ee_d = d["ex_embed"]
-    ex_embed = EmbeddingTable(dim=ee_d["dim"], lr=ee_d["lr"], table=ee_d["table"])
+    user_embed = EmbeddingTable.from_dict(d["user_embed"])
+    ex_embed = EmbeddingTable.from_dict(d["ex_embed"])
 
     # New models — defensive fallback for old JSON files that predate these fields
     if "bayesian_rpe" in d:
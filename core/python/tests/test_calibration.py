@@ -0,0 +1,19 @@
+from kinetiq_core.ml.calibration import RPECalibration
+
+
+def test_update_batch_matches_sequential_updates():
+    residuals = [0.4, -0.2, 1.1, 0.0, -0.7, 0.3]
+
+    seq = RPECalibration()
+    for r in residuals:
+        seq.update(r)
+
+    batched = RPECalibration()
+    batched.update(residuals[0])
+    batched.update_batch(residuals[1:4])
+    batched.update_batch(residuals[4:])
+    batched.update_batch([])
+
+    assert batched.n == seq.n
+    assert abs(batched.bias - seq.bias) < 1e-12
+    assert abs(batched.variance - seq.variance) < 1e-12
@@ -23,7 +23,7 @@ from kinetiq_core.ml.state import MLState
 from kinetiq_core.ml.features import make_feature_vector
 from kinetiq_core.ml.bayesian_rpe import BayesianRPEPredictor
 from kinetiq_core.ml.user_clustering import UserClustering
-from kinetiq_core.ml.bandit import LinUCBBandit
+from kinetiq_core.ml.bandit import LinUCBBandit, LinearTSBandit
 from kinetiq_core.ml.plateau import detect_plateau, apply_auto_deload
 from kinetiq_core.ml.online_models import OnlineLinearRegressor
 
@@ -242,6 +242,40 @@ def test_bandit_action_classification():
     assert accuracy > 0.20, f"Bandit accuracy {accuracy:.2f} should beat random baseline (0.20)"
 
 
+def test_linear_ts_bandit_prefers_rewarded_action():
+    ACTIONS = ["add_weight", "add_reps", "stay", "lower_reps", "lower_weight"]
+    x = [0.4, 0.2, 0.8, 0.0] + [0.0] * 12
+
+    bandit = LinearTSBandit(dim=16, alpha=0.1, seed=7)
+    for _ in range(20):
+        bandit.update("stay", x, 1.0)
+        bandit.update("add_weight", x, -1.0)
+
+    picks = [bandit.choose(ACTIONS, x) for _ in range(20)]
+    assert picks.count("stay") == 20
+
+    again = LinearTSBandit.from_dict(bandit.to_dict())
+    assert again.choose(ACTIONS, x) == "stay"
+
+
+def test_bandit_serialization_keeps_kind_and_seed():
+    ts = LinearTSBandit(dim=16, alpha=0.1, seed=7)
+    ts.update("stay", [1.0] + [0.0] * 15, 1.0)
+
+    # Loaded through the base class, as the server does
+    again = LinUCBBandit.from_dict(ts.to_dict())
+    assert type(again) is LinearTSBandit and again.seed == 7
+    assert again.to_dict() == ts.to_dict()
+
+    # States saved before "kind" was stored load as LinUCB
+    legacy = LinUCBBandit(dim=16).to_dict()
+    del legacy["kind"]
+    assert type(LinUCBBandit.from_dict(legacy)) is LinUCBBandit
+
+    assert type(MLState(bandit_kind="linear_ts").bandit) is LinearTSBandit
+    assert type(MLState().bandit) is LinUCBBandit
+
+
 # ── Test d: Clustering Silhouette Score ───────────────────────────────────────
 
 def _euclidean(a: List[float], b: List[float]) -> float:
@@ -0,0 +1,58 @@
+from kinetiq_core.models import SetLog
+from kinetiq_core.ml.features import summarize_history
+from kinetiq_core.ml.history import SetHistoryBuffer
+
+
+def test_history_buffer_summary_matches_list_summary():
+    history = [SetLog(weight=185, reps=5, rpe=r) for r in (7.0, 7.5, 8.0, 8.5, 9.5)]
+
+    buf = SetHistoryBuffer()
+    for s in history:
+        buf.append(s)
+
+    a = summarize_history(history)
+    b = summarize_history(buf)
+    assert b.last_rpe == a.last_rpe == 9.5
+    assert abs(b.avg_rpe_3 - a.avg_rpe_3) < 1e-9
+    assert abs(b.rpe_trend_3 - a.rpe_trend_3) < 1e-9
+    assert summarize_history(SetHistoryBuffer().sync(history, end=4)) == summarize_history(history[:4])
+
+
+def test_feature_matrix_rows_match_feature_vectors():
+    from kinetiq_core import ExerciseConfig, UserSettings
+    from kinetiq_core.ml.features import make_feature_matrix, make_feature_vector
+    from kinetiq_core.ml.state import MLState
+
+    state = MLState()
+    ex = ExerciseConfig(name="bench_press", rep_range=(5, 8), target_rpe_range=(7.0, 9.0))
+    settings = UserSettings()
+    history = [SetLog(weight=185, reps=5, rpe=r) for r in (7.0, 7.5, 8.0)]
+
+    X = make_feature_matrix(state, "u", ex, settings, [185.0, 190.0, 180.0], [6, 5, 5], history)
+    for row, (w, r) in zip(X, [(185.0, 6), (190.0, 5), (180.0, 5)]):
+        assert (row == make_feature_vector(state, "u", ex, settings, w, r, history)).all()
+
+
+def test_set_history_buffer_sync_tracks_growing_history():
+    history = [SetLog(weight=100 + i, reps=5 + i % 3, rpe=6.0 + (i % 7) * 0.5) for i in range(40)]
+    buf = SetHistoryBuffer(keep=4)
+    for end in range(1, len(history) + 1):
+        buf.sync(history, end=end)
+        assert summarize_history(buf) == summarize_history(history[:end])
+    assert buf.reps[buf.n - 1] == history[-1].reps
+
+    # A history that no longer extends what was appended is rebuilt from its tail
+    other = history[:10] + [SetLog(weight=90, reps=5, rpe=9.5)]
+    assert summarize_history(buf.sync(other)) == summarize_history(other)
+
+
+def test_set_history_buffer_rebuilds_for_other_history_with_same_last_set():
+    shared = SetLog(weight=185, reps=5, rpe=8.0)
+    a = [SetLog(weight=185, reps=5, rpe=r) for r in (6.0, 6.5)] + [shared]
+    b = [SetLog(weight=185, reps=5, rpe=r) for r in (9.0, 9.5)] + [shared]
+
+    buf = SetHistoryBuffer(keep=4).sync(a)
+    assert summarize_history(buf.sync(b)) == summarize_history(b)
+    assert summarize_history(buf.sync(a + [SetLog(weight=190, reps=5, rpe=8.5)])) == summarize_history(
+        a + [SetLog(weight=190, reps=5, rpe=8.5)]
+    )
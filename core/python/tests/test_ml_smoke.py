@@ -1,4 +1,10 @@
+import pytest
+
 from kinetiq_core import Unit, UserSettings, SetLog, ExerciseConfig, suggest_next_set, MLState
+from kinetiq_core.ml import _policy_kernels
+from kinetiq_core.ml.features import make_feature_vector
+from kinetiq_core.ml.policy import suggest_next_set_ml
+from kinetiq_core.models import ACTION_NAMES, ActionCode
 
 
 def test_ml_policy_smoke():
@@ -16,3 +22,47 @@ def test_ml_policy_smoke():
     sug = suggest_next_set(ex, last, settings, use_ml=True, ml_state=state, user_id="matthew", history=history)
     assert 5 <= sug.next_reps <= 8
     assert sug.next_weight > 0
+
+
+def test_ml_guardrails_leave_state_untouched():
+    settings = UserSettings(unit=Unit.LB)
+    ex = ExerciseConfig(name="bench_press", rep_range=(5, 8), target_rpe_range=(7.0, 9.0))
+    history = [SetLog(weight=185, reps=5, rpe=8.0) for _ in range(6)]
+
+    state = MLState()
+    too_hard = SetLog(weight=185, reps=5, rpe=9.5)
+    sug = suggest_next_set(ex, too_hard, settings, use_ml=True, ml_state=state, user_id="u", history=history + [too_hard])
+    assert sug.action in ("lower_weight", "lower_reps")
+
+    with pytest.raises(ValueError):
+        bad = SetLog(weight=185, reps=5, rpe=0.5)
+        suggest_next_set(ex, bad, settings, use_ml=True, ml_state=state, user_id="u", history=history + [bad])
+
+    assert not state.calibration_by_ex
+
+
+def test_ml_bandit_context_is_stay_candidate_features():
+    settings = UserSettings(unit=Unit.LB)
+    ex = ExerciseConfig(name="bench_press", rep_range=(5, 8), target_rpe_range=(7.0, 9.0))
+    history = [SetLog(weight=185, reps=5 + i % 3, rpe=7.0 + 0.25 * i) for i in range(7)]
+    last = history[-1]
+
+    state = MLState()
+    seen = []
+    choose_index = state.bandit.choose_index
+    state.bandit.choose_index = lambda actions, x, user_key="default": (
+        seen.append(x.copy()) or choose_index(actions, x, user_key)
+    )
+    suggest_next_set_ml(state, "u", ex, last, settings, history)
+
+    expected = make_feature_vector(state, "u", ex, settings, last.weight, last.reps, history)
+    assert len(seen) == 1
+    assert (seen[0] == expected).all()
+
+
+def test_policy_action_ids_are_action_codes():
+    for name in ("ADD_WEIGHT", "ADD_REPS", "STAY", "LOWER_REPS", "LOWER_WEIGHT"):
+        assert getattr(_policy_kernels, name) == ActionCode[name]
+    # Bandit arm order (and so its tie-break) is unchanged: add_weight first
+    assert _policy_kernels.BANDIT_ARM_NAMES == ("add_weight", "add_reps", "stay", "lower_reps", "lower_weight")
+    assert all(ACTION_NAMES[a] == n for a, n in zip(_policy_kernels.BANDIT_ARMS, _policy_kernels.BANDIT_ARM_NAMES))
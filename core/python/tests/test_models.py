@@ -0,0 +1,7 @@
+from kinetiq_core.models import ExerciseConfig, SetLog, Suggestion, UserSettings
+
+
+def test_hot_path_models_are_slotted():
+    for cls in (SetLog, Suggestion, UserSettings, ExerciseConfig):
+        assert "__slots__" in cls.__dict__ and "__dict__" not in cls.__dict__
+    assert not hasattr(SetLog(185.0, 5, 8.0), "__dict__")
@@ -0,0 +1,29 @@
+import numpy as np
+
+from kinetiq_core.ml.online_models import OnlineLinearRegressor, OnlineLogisticRegressor
+
+
+def test_predict_proba_batch_matches_scalar():
+    model = OnlineLogisticRegressor(dim=4)
+    rng = np.random.default_rng(0)
+    for _ in range(50):
+        model.update(rng.normal(size=4), float(rng.random() > 0.5))
+
+    X = rng.normal(size=(7, 4)) * 50.0  # includes saturated logits
+    probs = model.predict_proba_batch(X)
+    assert probs.shape == (7,)
+    for x, p in zip(X, probs):
+        assert abs(p - model.predict_proba(x)) < 1e-6
+
+
+def test_predict_batch_matches_scalar():
+    model = OnlineLinearRegressor(dim=4)
+    rng = np.random.default_rng(1)
+    for _ in range(50):
+        model.update(rng.normal(size=4), float(rng.uniform(5.0, 10.0)))
+
+    X = rng.normal(size=(7, 4)).astype(np.float32)
+    preds = model.predict_batch(X)
+    assert preds.shape == (7,)
+    for x, p in zip(X, preds):
+        assert abs(p - model.predict(x)) < 1e-5
@@ -17,3 +17,10 @@ def test_jump_from_rpe_units():
     assert lb >= 5.0
     assert kg > 0
     assert kg < lb
+
+
+def test_jump_from_rpe_lb_batch_matches_scalar():
+    from kinetiq_core.progression import jump_from_rpe_lb_batch
+
+    rpes = [0.5, 1.0, 2.3, 3.0, 3.5, 4.0, 5.55, 7.0, 8.37, 10.0, 11.0]
+    assert jump_from_rpe_lb_batch(rpes).tolist() == [jump_from_rpe_lb(r) for r in rpes]
@@ -1,5 +1,16 @@
-from kinetiq_core.models import Unit, UserSettings, ExerciseConfig, SetLog
-from kinetiq_core.rpe_rules import suggest_next_set_from_rpe
+from dataclasses import replace
+
+import pytest
+
+from kinetiq_core.models import ActionCode, Unit, UserSettings, ExerciseConfig, SetLog
+from kinetiq_core.rpe_rules import (
+    compile_decider,
+    replay_log,
+    suggest_next_set_from_rpe,
+    suggest_next_set_from_rpe_debug,
+)
+from kinetiq_core.rpe_rules_kernels import ACTIONS, _decide
+from kinetiq_core.set_history import HistoryIndex, history_arrays
 
 def base():
     settings = UserSettings(unit=Unit.LB, lb_increment=2.5, max_jump_lb=10.0)
@@ -9,7 +20,7 @@ def base():
 def test_too_easy_increases_weight_first_and_resets_reps():
     settings, cfg = base()
     last = SetLog(weight=185, reps=7, rpe=5.0)  # below 7.0
-    sug = suggest_next_set_from_rpe(last, cfg, settings)
+    sug = suggest_next_set_from_rpe(last, cfg, settings, strategy="weight_first")
     assert sug.action == "add_weight"
     assert sug.next_weight > 185
     assert sug.next_reps == 5
@@ -49,7 +60,88 @@ def test_in_target_at_cap_manageable_add_weight():
 def test_too_easy_weight_first_resets_reps_to_min():
     settings, cfg = base()
     last = SetLog(weight=185, reps=7, rpe=2.0)  # too easy => weight-first
-    sug = suggest_next_set_from_rpe(last, cfg, settings)
+    sug = suggest_next_set_from_rpe(last, cfg, settings, strategy="weight_first")
     assert sug.action == "add_weight"
     assert sug.next_weight > 185
     assert sug.next_reps == cfg.rep_range[0]  # rep_min
+
+
+def test_decide_kernel_takes_and_returns_primitives():
+    # 84 kg x 8 @ RPE 6.5 at the rep cap (lb user, 2.5 lb increment, 10 lb max jump)
+    out = _decide(84.0, 8, 6.5, 5, 8, 7.0, 9.0, 1.134, 4.536, 8.5, 1.0, True, False)
+    assert [type(v) for v in out] == [int, float, int, int]
+    action_id, next_w_kg, next_reps, _ = out
+    assert ACTIONS[action_id] == "add_weight"
+    assert next_w_kg > 84.0
+    assert next_reps == 5
+
+
+def test_replay_log_matches_per_set_list_history():
+    settings, cfg = base()
+    rpes = [8.5, 8.0, 7.5, 8.5, 7.0, 9.5, 8.0, 7.0]
+    logs = [SetLog(weight=185.0, reps=5 + i % 2, rpe=r) for i, r in enumerate(rpes)]
+
+    replayed = replay_log(history_arrays(logs), cfg, settings)
+    expected = [suggest_next_set_from_rpe(s, cfg, settings, history=logs[: i + 1]) for i, s in enumerate(logs)]
+    assert replayed == expected
+
+
+def test_compile_decider_is_cached_and_matches_suggest():
+    settings, cfg = base()
+    decider = compile_decider(cfg, settings)
+    assert compile_decider(cfg, settings) is decider
+    # Keyword and positional calls share one cache entry
+    assert compile_decider(cfg, settings, explain=True) is decider
+    assert compile_decider(cfg, settings, "jeff_b", False, True) is decider
+
+    history = [SetLog(weight=185.0, reps=6, rpe=r) for r in (9.0, 8.5, 7.5)]
+    last = history[-1]
+    assert decider(last, history=history) == suggest_next_set_from_rpe(last, cfg, settings, history=history)
+
+
+def test_exercise_config_rejects_invalid_rep_range_at_construction():
+    with pytest.raises(ValueError):
+        ExerciseConfig(name="bench", rep_range=(8, 5))
+    with pytest.raises(ValueError):
+        ExerciseConfig(name="bench", rep_range=(0, 5))
+
+
+def test_history_index_matches_list_history():
+    settings, cfg = base()
+    rpes = [8.5, 9.0, 8.0, 8.5, 7.0, 8.0, 7.5, 9.0]
+    logs = [SetLog(weight=185.0, reps=5 + i % 2, rpe=r) for i, r in enumerate(rpes)]
+
+    index = HistoryIndex()
+    for i, s in enumerate(logs):
+        index.append(s)
+        assert suggest_next_set_from_rpe(s, cfg, settings, history=index) == suggest_next_set_from_rpe(
+            s, cfg, settings, history=logs[: i + 1]
+        )
+    assert index.recent(185, 5, 3) == [7.5, 7.0, 8.0]
+
+
+def test_debug_variant_only_adds_the_debug_dict():
+    settings, cfg = base()
+    last = SetLog(weight=185, reps=6, rpe=8.0)
+    plain = suggest_next_set_from_rpe(last, cfg, settings)
+    dbg = suggest_next_set_from_rpe_debug(last, cfg, settings)
+    assert plain.debug is None
+    assert dbg.debug["outputs"]["next_reps"] == dbg.next_reps
+    assert replace(dbg, debug=None) == plain
+    assert suggest_next_set_from_rpe(last, cfg, settings, debug=True) == dbg
+
+
+def test_action_code_matches_kernel_action_ids():
+    assert [ACTIONS[c] for c in ActionCode] == [c.name.lower() for c in ActionCode]
+    settings, cfg = base()
+    sug = suggest_next_set_from_rpe(SetLog(weight=185, reps=8, rpe=6.5), cfg, settings)
+    assert sug.action_code is ActionCode.ADD_WEIGHT and sug.action == "add_weight"
+
+
+def test_replay_log_without_explanations_keeps_decisions():
+    settings, cfg = base()
+    logs = [SetLog(weight=185.0, reps=r, rpe=e) for r, e in ((5, 8.5), (6, 8.0), (8, 6.5), (5, 9.5))]
+    full = replay_log(history_arrays(logs), cfg, settings)
+    bare = replay_log(history_arrays(logs), cfg, settings, explain=False)
+    assert all(s.explanation == "" for s in bare)
+    assert bare == [replace(s, explanation="") for s in full]
@@ -0,0 +1,26 @@
+import numpy as np
+
+from kinetiq_core.simulation import SimLifter, SimTable
+
+
+def test_compiled_rpe_matches_rpe_for_set():
+    lifter = SimLifter(seed=0)
+    cases = [
+        (185.0, 5, 5, 0.0),
+        (225.0, 8, 5, 0.4),
+        (135.0, 5, 5, -0.6),   # clamps at 1.0
+        (300.0, 12, 5, 0.5),   # clamps at 10.0
+    ]
+    for _ in range(2):
+        for w, reps, rep_min, off in cases:
+            assert lifter.rpe_fn(w, reps, rep_min, off) == lifter.rpe_for_set(w, reps, rep_min, off)
+        # recompiled after base_strength adapts
+        lifter.adapt_after_session(np.array([8.0, 8.0, 8.0]))
+
+
+def test_sim_table_schedule_columns():
+    table = SimTable.allocate(weeks=2, sessions=2, sets=3)
+    assert len(table) == 12
+    assert table.week.tolist() == [1] * 6 + [2] * 6
+    assert table.session_in_week.tolist() == ([1] * 3 + [2] * 3) * 2
+    assert table.set_in_session.tolist() == [1, 2, 3] * 4
@@ -0,0 +1,60 @@
+import json
+from dataclasses import fields
+
+from kinetiq_core.models import SetLog
+from kinetiq_core.storage import append_log, default_log_path, load_logs, setlog_to_entry
+
+
+def test_append_log_jsonl_roundtrip(tmp_path):
+    path = tmp_path / "set_logs.jsonl"
+    append_log("bench_press", setlog_to_entry(SetLog(185.0, 5, 8.0), "2026-01-01T10:00:00"), path)
+    append_log("squat", setlog_to_entry(SetLog(225.0, 6, 7.5), "2026-01-01T10:05:00"), path)
+    append_log("bench_press", setlog_to_entry(SetLog(185.0, 6, 8.5), "2026-01-01T10:10:00"), path)
+
+    assert len(path.read_text().splitlines()) == 3
+    logs = load_logs(path)
+    assert [e["reps"] for e in logs["bench_press"]] == [5, 6]
+    assert logs["squat"] == [{"weight": 225.0, "reps": 6, "rpe": 7.5, "ts": "2026-01-01T10:05:00"}]
+
+
+def test_load_logs_reads_legacy_json(tmp_path):
+    path = tmp_path / "set_logs.json"
+    path.write_text(json.dumps({"bench_press": [{"weight": 185.0, "reps": 5, "rpe": 8.0, "ts": None}]}))
+    append_log("bench_press", {"weight": 190.0, "reps": 5, "rpe": 8.5, "ts": None}, path)
+
+    assert [e["weight"] for e in load_logs(path)["bench_press"]] == [185.0, 190.0]
+
+
+def test_default_log_path_falls_back_to_legacy_json(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    assert default_log_path().name == "set_logs.jsonl"
+
+    (tmp_path / "data").mkdir()
+    (tmp_path / "data" / "set_logs.json").write_text(
+        json.dumps({"bench_press": [{"weight": 185.0, "reps": 5, "rpe": 8.0, "ts": None}]})
+    )
+    assert default_log_path().name == "set_logs.json"
+    assert load_logs()["bench_press"][0]["weight"] == 185.0
+
+    (tmp_path / "data" / "set_logs.jsonl").touch()
+    assert default_log_path().name == "set_logs.jsonl"
+
+
+def test_setlog_to_entry_covers_every_setlog_field():
+    entry = setlog_to_entry(SetLog(185.0, 5, 8.0), "2026-01-01T10:00:00")
+    assert set(entry) == {f.name for f in fields(SetLog)} | {"ts"}
+    assert setlog_to_entry(SetLog(185.0, 5, 8.0), None) == {"weight": 185.0, "reps": 5, "rpe": 8.0, "ts": None}
+
+
+def test_load_logs_large_file_matches_small_path(tmp_path):
+    from kinetiq_core import storage
+
+    path = tmp_path / "set_logs.jsonl"
+    for i in range(2000):
+        append_log("squat" if i % 3 else "bench_press", setlog_to_entry(SetLog(100.0 + i, 5, 8.0), None), path)
+    assert path.stat().st_size >= storage._MMAP_MIN_BYTES
+
+    logs = load_logs(path)
+    assert len(logs["bench_press"]) + len(logs["squat"]) == 2000
+    with path.open("rb") as f:
+        assert logs == storage._group_entries(f)
@@ -1,4 +1,4 @@
-from kinetiq_core.units import to_kg, from_kg, round_to_increment
+from kinetiq_core.units import to_kg, to_kg_f, from_kg, round_to_increment
 from kinetiq_core.models import Unit
 
 def test_lb_kg_roundtrip():
@@ -6,7 +6,10 @@ def test_lb_kg_roundtrip():
     w_kg = to_kg(w_lb, Unit.LB)
     back = from_kg(w_kg, Unit.LB)
     assert abs(back - w_lb) < 1e-6
+    assert to_kg_f(w_lb, True) == w_kg
+    assert to_kg(100.0, Unit.KG) == to_kg_f(100.0, False) == 100.0
 
 def test_round_to_increment():
     assert round_to_increment(187.49, 2.5) == 187.5
     assert round_to_increment(186.26, 2.5) == 187.5  # nearest
+    assert round_to_increment(186.25, 2.5) == 187.5  # halves round up